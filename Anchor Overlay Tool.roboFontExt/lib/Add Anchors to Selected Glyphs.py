@@ -0,0 +1,20 @@
+"""
+Add top and bottom anchors to the selected glyphs, based on their outlines
+and the font metrics. Existing anchors are not changed.
+"""
+
+from AutoAnchors import AutoAnchors
+
+
+f = CurrentFont()
+
+glyphs = []
+
+if CurrentGlyph() is not None:
+    glyphs = [CurrentGlyph().name]
+elif f.selection:
+    glyphs = f.selection
+
+auto = AutoAnchors(f)
+count = auto.apply(auto.compute(glyphs))
+print("Added %i anchors to %i glyphs." % (count, len(glyphs)))
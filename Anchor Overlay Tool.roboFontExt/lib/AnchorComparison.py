@@ -0,0 +1,206 @@
+import codecs
+from json import dump
+from os.path import expanduser, join, splitext
+from weakref import WeakKeyDictionary, ref
+
+from FontAnchors import getFontName
+from GlyphVersion import getGlyphVersion
+
+
+class AnchorComparison(object):
+    # The anchors of glyphs that haven't changed since the last export are
+    # reused, so repeated exports only read the changed glyphs again. The
+    # anchors are cached per font and go away with the font.
+    _anchorCache = WeakKeyDictionary()
+    # File path -> (weak references to the fonts, rows of the last export)
+    _snapshots = {}
+
+    def __init__(self, fontlist=[]):
+        fonts = []
+        for f in fontlist:
+            fonts.append((f.info.openTypeOS2WeightClass, f))
+        fonts.sort(key=lambda i: i[0])
+        self.fonts = [f[1] for f in fonts]
+        # glyph name -> (glyph version, anchors by name), per font
+        self.anchorCaches = [
+            self._anchorCache.setdefault(f.naked(), {}) for f in self.fonts
+        ]
+
+    def get_global_glyph_list(self):
+        gl = []
+        for f in self.fonts:
+            gl.extend(f.glyphOrder)
+        return sorted(list(set(gl)))
+
+    def get_global_anchor_list(self, glyph_name):
+        al = []
+        for f in self.fonts:
+            if glyph_name in f:
+                al.extend([a.name for a in f[glyph_name].anchors])
+        return sorted(list(set(al)))
+
+    def get_anchors_by_name(self, glyph):
+        anchor_names = [a.name for a in glyph.anchors]
+        if len(anchor_names) != len(set(anchor_names)):
+            print("  WARNING: Duplicate anchor name in %s" % glyph.name)
+        return {a.name: (a.x, a.y) for a in glyph.anchors}
+
+    def _get_glyph_anchors(self, name):
+        # Return the anchors by name of the glyph in each font, None for
+        # fonts without the glyph, and whether any font had to be read
+        # again because the glyph changed since the last call
+        glyph_anchors = []
+        changed = False
+        for f, cache in zip(self.fonts, self.anchorCaches):
+            if name not in f:
+                if cache.pop(name, None) is not None:
+                    changed = True
+                glyph_anchors.append(None)
+                continue
+            glyph = f[name]
+            version = getGlyphVersion(glyph)
+            cached = cache.get(name)
+            if cached is None or cached[0] is not version:
+                cached = (version, self.get_anchors_by_name(glyph))
+                cache[name] = cached
+                changed = True
+            glyph_anchors.append(cached[1])
+        return glyph_anchors, changed
+
+    def _get_glyph_rows(self, name, glyph_anchors):
+        # Return a list of ((glyph, anchor), csv line) for one glyph
+        rows = []
+        anchor_names = set()
+        for anchors in glyph_anchors:
+            if anchors is not None:
+                anchor_names.update(anchors)
+        for anchor in sorted(anchor_names):
+            line = "%s;%s;" % (name, anchor)
+            for anchors in glyph_anchors:
+                if anchors is None:
+                    line += "(no glyph);"
+                elif anchor in anchors:
+                    pos = anchors[anchor]
+                    line += "%i;%i;" % (pos[0], pos[1])
+                else:
+                    line += ";;"
+            rows.append(((name, anchor), line))
+        return rows
+
+    def get_comparison_rows(self):
+        # Return a list of ((glyph, anchor), csv line) for all glyphs,
+        # recomputing only the glyphs that changed since the last call
+        rows = []
+        self.numChangedGlyphs = 0
+        for name in self.get_global_glyph_list():
+            glyph_anchors, changed = self._get_glyph_anchors(name)
+            if changed:
+                self.numChangedGlyphs += 1
+            rows.extend(self._get_glyph_rows(name, glyph_anchors))
+        return rows
+
+    def get_header(self):
+        csv = "Glyph;Anchor;"
+        for i in range(len(self.fonts)):
+            csv += "%s;%s;" % (
+                self.fonts[i].info.familyName,
+                self.fonts[i].info.styleName,
+            )
+        return csv + "\n"
+
+    def get_comparison_csv(self, rows=None):
+        if rows is None:
+            rows = self.get_comparison_rows()
+        return self.get_header() + "".join(line + "\n" for _, line in rows)
+
+    def get_delta_csv(self, rows, snapshot):
+        # Return the rows that were added, changed or removed compared to
+        # the snapshot of a previous export, or None if nothing changed
+        current = dict(rows)
+        lines = []
+        for key, line in rows:
+            if snapshot.get(key) != line:
+                lines.append(line)
+        for key in sorted(set(snapshot) - set(current)):
+            lines.append("%s;%s;(removed);" % key)
+        if not lines:
+            return None
+        return self.get_header() + "".join(line + "\n" for line in lines)
+
+    def _get_snapshot(self, path):
+        # Return the rows of the last export to path, if it was written for
+        # the same fonts
+        entry = self._snapshots.get(path)
+        if entry is None:
+            return None
+        font_refs, rows = entry
+        if len(font_refs) != len(self.fonts) or any(
+            font_ref() is not f.naked()
+            for font_ref, f in zip(font_refs, self.fonts)
+        ):
+            return None
+        return rows
+
+    def _set_snapshot(self, path, rows):
+        # Forget the exports of fonts that were closed
+        for key, (font_refs, _) in list(self._snapshots.items()):
+            if any(font_ref() is None for font_ref in font_refs):
+                del self._snapshots[key]
+        self._snapshots[path] = (
+            [ref(f.naked()) for f in self.fonts],
+            dict(rows),
+        )
+
+    def save_comparison_csv(self, path=None):
+        # Write the full table. If the same file was written before in this
+        # session, also write the rows that changed since then to a
+        # separate file ending in "_Changes.csv".
+        if len(self.fonts) > 0:
+            if not path:
+                path = join(
+                    expanduser("~"),
+                    "Documents",
+                    "%s_Anchor_Comparison.csv" % self.fonts[0].info.familyName,
+                )
+            rows = self.get_comparison_rows()
+            with codecs.open(path, "wb", encoding="utf-8") as csv:
+                csv.write(self.get_comparison_csv(rows))
+            print(
+                "Anchor table written to '%s' (%i glyphs updated)."
+                % (path, self.numChangedGlyphs)
+            )
+            snapshot = self._get_snapshot(path)
+            if snapshot is not None:
+                delta = self.get_delta_csv(rows, snapshot)
+                if delta is None:
+                    print("No anchor changes since the last export.")
+                else:
+                    delta_path = "%s_Changes.csv" % splitext(path)[0]
+                    with codecs.open(
+                        delta_path, "wb", encoding="utf-8"
+                    ) as csv:
+                        csv.write(delta)
+                    print("Anchor changes written to '%s'." % delta_path)
+            self._set_snapshot(path, rows)
+        else:
+            print("There are no open fonts.")
+
+    def get_comparison_dict(self):
+        # Return {"Family Style": {glyph: {anchor: [x, y]}}} for all fonts
+        result = {}
+        for f in self.fonts:
+            result[getFontName(f)] = {
+                g.name: {
+                    name: list(pos)
+                    for name, pos in self.get_anchors_by_name(g).items()
+                }
+                for g in f
+                if g.anchors
+            }
+        return result
+
+    def save_comparison_json(self, path):
+        # Write the anchors as JSON, in the format read by AnchorImport
+        with codecs.open(path, "wb", encoding="utf-8") as f:
+            dump(self.get_comparison_dict(), f, indent=2, sort_keys=True)
+        print("Anchor table written to '%s'." % path)
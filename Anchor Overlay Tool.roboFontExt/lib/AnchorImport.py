@@ -0,0 +1,230 @@
+"""
+Import anchor positions from a table, e.g. after fixing them in a
+spreadsheet.
+
+Two formats are read:
+
+- The CSV table written by AnchorComparison (Export Anchor Table), with
+  the columns Glyph;Anchor;Family;Style;... and one x;y column pair per
+  font. Rows of a "_Changes.csv" file can be imported as well.
+- JSON as written by AnchorComparison.save_comparison_json:
+  {"Family Style": {"glyph": {"anchor": [x, y], ...}, ...}, ...}
+
+The table is checked against the anchor index of each target font first:
+glyphs that don't exist are skipped, and anchor names that are new to the
+font are reported. Only anchors whose position differs from the font are
+changed, in one EditTransaction per font, which is one undo step. The CSV
+export writes whole numbers, so positions from a CSV table are compared
+to the font positions cut off the same way, and importing an unedited
+export changes nothing. Anchors that are missing from the table are left
+alone. Anchors whose cells are empty in a CSV table, null in JSON, or
+marked "(removed)" in a changes file are only removed from the font if
+removeMissing is True.
+
+    anchorImport = AnchorImport(AllFonts())
+    anchorImport.importFile("MyFamily_Anchor_Comparison.csv")
+    print(anchorImport.getSummary())
+"""
+
+import codecs
+from json import load
+from os.path import splitext
+
+from EditTransaction import EditTransaction
+from FontAnchors import FontAnchors, getFontName
+
+
+def isJSONPath(path):
+    return splitext(path)[1].lower() == ".json"
+
+
+class AnchorImport(object):
+    def __init__(self, fonts, removeMissing=False):
+        self.fonts = {getFontName(font): font for font in fonts}
+        self.removeMissing = removeMissing
+        self.messages = []
+        self.numChangedAnchors = 0
+        self.numChangedGlyphs = 0
+
+    # Reading
+
+    def _parseCoordinate(self, value, path, lineNumber):
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                self.messages.append(
+                    "ERROR: %s, line %i: Invalid coordinate '%s'."
+                    % (path, lineNumber, value)
+                )
+        return None
+
+    def readCSV(self, path):
+        # Return the table {font name: {glyph: {anchor: position}}}. A
+        # position of None means the anchor is not in the font.
+        table = {}
+        with codecs.open(path, "rb", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        if not lines:
+            return table
+        header = lines[0].split(";")
+        fontNames = [
+            "%s %s" % (header[i], header[i + 1])
+            for i in range(2, len(header) - 1, 2)
+        ]
+        for fontName in fontNames:
+            table[fontName] = {}
+        for lineNumber, line in enumerate(lines[1:], 2):
+            if not line:
+                continue
+            cells = line.split(";")
+            if len(cells) < 2:
+                self.messages.append(
+                    "ERROR: %s, line %i: Expected glyph and anchor name, "
+                    "skipped." % (path, lineNumber)
+                )
+                continue
+            glyphName, anchorName = cells[:2]
+            values = cells[2:]
+            if values and values[0] == "(removed)":
+                for fontName in fontNames:
+                    table[fontName].setdefault(glyphName, {})[
+                        anchorName
+                    ] = None
+                continue
+            i = 0
+            for fontName in fontNames:
+                if i >= len(values):
+                    break
+                if values[i] == "(no glyph)":
+                    i += 1
+                    continue
+                if i + 1 >= len(values):
+                    self.messages.append(
+                        "ERROR: %s, line %i: Missing y coordinate."
+                        % (path, lineNumber)
+                    )
+                    break
+                x, y = values[i : i + 2]
+                i += 2
+                if x == "" and y == "":
+                    position = None
+                else:
+                    x = self._parseCoordinate(x, path, lineNumber)
+                    y = self._parseCoordinate(y, path, lineNumber)
+                    if x is None or y is None:
+                        continue
+                    position = (x, y)
+                table[fontName].setdefault(glyphName, {})[
+                    anchorName
+                ] = position
+        return table
+
+    def readJSON(self, path):
+        with codecs.open(path, "rb", encoding="utf-8") as f:
+            data = load(f)
+        table = {}
+        for fontName, glyphs in data.items():
+            table[fontName] = {}
+            for glyphName, anchors in glyphs.items():
+                glyphTable = table[fontName][glyphName] = {}
+                for anchorName, position in anchors.items():
+                    if position is not None:
+                        if len(position) != 2 or not all(
+                            isinstance(v, (int, float)) for v in position
+                        ):
+                            self.messages.append(
+                                "ERROR: %s: Invalid position %r of anchor "
+                                "'%s' in /%s."
+                                % (path, position, anchorName, glyphName)
+                            )
+                            continue
+                        position = tuple(position)
+                    glyphTable[anchorName] = position
+        return table
+
+    def read(self, path):
+        if isJSONPath(path):
+            return self.readJSON(path)
+        return self.readCSV(path)
+
+    # Checking and applying
+
+    def getChanges(self, font, glyphTable, wholeNumbers=False):
+        # Compare the table of one font to its anchor index. Returns a dict
+        # of glyph name -> {anchor name: new position or None to remove}.
+        # If wholeNumbers is True, the table was written with "%i", and the
+        # font positions are compared after the same conversion.
+        fontName = getFontName(font)
+        fontAnchors = FontAnchors(font)
+        positions = fontAnchors.anchorPositions
+        changes = {}
+        for glyphName in sorted(glyphTable):
+            if glyphName not in font:
+                self.messages.append(
+                    "WARNING: %s: Glyph /%s doesn't exist, skipped."
+                    % (fontName, glyphName)
+                )
+                continue
+            for anchorName, position in sorted(glyphTable[glyphName].items()):
+                current = positions.get((glyphName, anchorName))
+                if position is None:
+                    if current is None or not self.removeMissing:
+                        continue
+                elif current is not None and (
+                    tuple(int(v) if wholeNumbers else v for v in current)
+                    == position
+                ):
+                    continue
+                elif anchorName not in fontAnchors.anchorGlyphs:
+                    self.messages.append(
+                        "%s: New anchor name '%s' in /%s."
+                        % (fontName, anchorName, glyphName)
+                    )
+                changes.setdefault(glyphName, {})[anchorName] = position
+        return changes
+
+    def applyChanges(self, font, changes):
+        # Apply the changes to one font in one transaction and undo step
+        with EditTransaction(
+            font, "Import anchors", groupUndo=True
+        ) as transaction:
+            for glyphName, anchorChanges in changes.items():
+                glyph = transaction.getGlyph(glyphName)
+                anchors = {}
+                for anchor in glyph.anchors:
+                    # The first anchor of a name wins, like in the index
+                    anchors.setdefault(anchor.name, anchor)
+                for anchorName, position in anchorChanges.items():
+                    anchor = anchors.get(anchorName)
+                    if position is None:
+                        glyph.removeAnchor(anchor)
+                    elif anchor is None:
+                        glyph.appendAnchor(anchorName, position)
+                    else:
+                        anchor.x, anchor.y = position
+                    self.numChangedAnchors += 1
+                self.numChangedGlyphs += 1
+
+    def importTable(self, table, wholeNumbers=False):
+        for fontName in sorted(table):
+            font = self.fonts.get(fontName)
+            if font is None:
+                self.messages.append(
+                    "WARNING: Font '%s' is not open, skipped." % fontName
+                )
+                continue
+            changes = self.getChanges(font, table[fontName], wholeNumbers)
+            if changes:
+                self.applyChanges(font, changes)
+
+    def importFile(self, path):
+        self.importTable(self.read(path), wholeNumbers=not isJSONPath(path))
+
+    def getSummary(self):
+        return "%i anchors changed in %i glyphs." % (
+            self.numChangedAnchors,
+            self.numChangedGlyphs,
+        )
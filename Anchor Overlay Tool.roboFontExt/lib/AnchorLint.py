@@ -0,0 +1,219 @@
+"""
+Anchor consistency checks for one or more fonts.
+
+Checks per font:
+- orphan-mark: a mark anchor ("_top") for which no glyph has the
+  matching base anchor ("top")
+- orphan-base: a base anchor for which no glyph has the matching mark
+  anchor, so no mark can attach to it
+- outside-bbox: an anchor that is further than a tolerance outside of the
+  glyph's bounding box
+- duplicate: more than one anchor with the same name in a glyph
+
+Checks across fonts:
+- incompatible: a glyph has different anchor names in different fonts
+
+In RoboFont, the open fonts are checked one after the other. From the
+command line, UFOs are checked in parallel, one process per font, and the
+exit code is 1 if any issue was found, so the script can gate a build:
+
+    python AnchorLint.py --outside 100 Regular.ufo Bold.ufo
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import sys
+
+from FontAnchors import FontAnchors, getFontName
+
+
+allRules = ("orphan-mark", "orphan-base", "outside-bbox", "duplicate")
+
+defaultOutsideTolerance = 200
+
+
+def _getIssue(rule, fontName, glyphName, anchorName, message):
+    return {
+        "rule": rule,
+        "font": fontName,
+        "glyph": glyphName,
+        "anchor": anchorName,
+        "message": message,
+    }
+
+
+def lintFont(font, rules=allRules, outsideTolerance=defaultOutsideTolerance):
+    # Run the per-font rules. Returns the font name, the list of issues,
+    # and a dict of glyph name -> sorted anchor names for the checks across
+    # fonts.
+    fontName = getFontName(font)
+    fontAnchors = FontAnchors(font)
+    anchorGlyphs = fontAnchors.anchorGlyphs
+    issues = []
+
+    for anchorName in sorted(anchorGlyphs):
+        matchingName = fontAnchors.getMatchingAnchorName(anchorName)
+        if matchingName in anchorGlyphs:
+            continue
+        if anchorName.startswith("_"):
+            rule = "orphan-mark"
+            message = "No glyph has the base anchor '%s'." % matchingName
+        else:
+            rule = "orphan-base"
+            message = "No glyph has the mark anchor '%s'." % matchingName
+        if rule in rules:
+            for glyphName in anchorGlyphs[anchorName]:
+                issues.append(
+                    _getIssue(rule, fontName, glyphName, anchorName, message)
+                )
+
+    if "outside-bbox" in rules:
+        glyphAnchors = {}
+        for glyphName, anchorName in fontAnchors.anchorPositions:
+            glyphAnchors.setdefault(glyphName, []).append(anchorName)
+        for glyphName in sorted(glyphAnchors):
+            bounds = font[glyphName].bounds
+            if bounds is None:
+                continue
+            xMin, yMin, xMax, yMax = bounds
+            for anchorName in sorted(glyphAnchors[glyphName]):
+                x, y = fontAnchors.anchorPositions[glyphName, anchorName]
+                distance = max(xMin - x, x - xMax, yMin - y, y - yMax)
+                if distance > outsideTolerance:
+                    issues.append(
+                        _getIssue(
+                            "outside-bbox",
+                            fontName,
+                            glyphName,
+                            anchorName,
+                            "Anchor is %i units outside of the bounding box."
+                            % distance,
+                        )
+                    )
+
+    if "duplicate" in rules:
+        for glyphName, anchorName in fontAnchors.duplicateAnchors:
+            issues.append(
+                _getIssue(
+                    "duplicate",
+                    fontName,
+                    glyphName,
+                    anchorName,
+                    "Duplicate anchor name.",
+                )
+            )
+
+    anchorNames = {glyphName: [] for glyphName in font.keys()}
+    for glyphName, anchorName in fontAnchors.anchorPositions:
+        anchorNames.setdefault(glyphName, []).append(anchorName)
+    anchorNames = {k: sorted(v) for k, v in anchorNames.items()}
+    return fontName, issues, anchorNames
+
+
+def lintCompatibility(fontResults):
+    # Compare the anchor names of each glyph across fonts. fontResults is a
+    # list of (fontName, issues, anchorNames) as returned by lintFont.
+    issues = []
+    allGlyphNames = set()
+    for _, _, anchorNames in fontResults:
+        allGlyphNames.update(anchorNames)
+    for glyphName in sorted(allGlyphNames):
+        nameSets = [
+            set(anchorNames.get(glyphName, []))
+            for _, _, anchorNames in fontResults
+        ]
+        allNames = set.union(*nameSets)
+        for (fontName, _, anchorNames), names in zip(fontResults, nameSets):
+            if glyphName not in anchorNames:
+                # The glyph is missing in this font
+                continue
+            for anchorName in sorted(allNames - names):
+                issues.append(
+                    _getIssue(
+                        "incompatible",
+                        fontName,
+                        glyphName,
+                        anchorName,
+                        "Anchor is missing in this font.",
+                    )
+                )
+    return issues
+
+
+def lintFonts(fonts, rules=allRules, outsideTolerance=defaultOutsideTolerance):
+    # Check open font objects one after the other
+    results = [lintFont(font, rules, outsideTolerance) for font in fonts]
+    return _collectIssues(results)
+
+
+def _lintPath(args):
+    from fontParts.world import OpenFont
+
+    path, rules, outsideTolerance = args
+    return lintFont(OpenFont(path), rules, outsideTolerance)
+
+
+def lintPaths(
+    paths,
+    rules=allRules,
+    outsideTolerance=defaultOutsideTolerance,
+    workers=None,
+):
+    # Check UFO files in parallel, one process per font
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(
+            executor.map(
+                _lintPath, [(path, rules, outsideTolerance) for path in paths]
+            )
+        )
+    return _collectIssues(results)
+
+
+def _collectIssues(results):
+    issues = []
+    for _, fontIssues, _ in results:
+        issues.extend(fontIssues)
+    if len(results) > 1:
+        issues.extend(lintCompatibility(results))
+    return issues
+
+
+def formatIssue(issue):
+    return "%s /%s '%s' [%s]: %s" % (
+        issue["font"],
+        issue["glyph"],
+        issue["anchor"],
+        issue["rule"],
+        issue["message"],
+    )
+
+
+def main(args=None):
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Check anchors in UFO fonts.")
+    parser.add_argument("ufos", nargs="+", metavar="UFO")
+    parser.add_argument(
+        "--outside",
+        type=int,
+        default=defaultOutsideTolerance,
+        help="Tolerance in units for anchors outside of the bounding box",
+    )
+    parser.add_argument(
+        "--skip",
+        action="append",
+        default=[],
+        choices=allRules,
+        help="Rule to skip, can be given more than once",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    options = parser.parse_args(args)
+    rules = tuple(rule for rule in allRules if rule not in options.skip)
+    issues = lintPaths(options.ufos, rules, options.outside, options.workers)
+    for issue in issues:
+        print(formatIssue(issue))
+    print("%i anchor issues found." % len(issues))
+    return 1 if issues else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+from math import log
+
+from GlyphGeometry import getGlyphMetrics
+
+
+# Lower limit for the variance of normalized anchor coordinates, so names
+# that were only seen once or always at exactly the same spot don't win or
+# lose by absurd margins
+minVariance = 0.005
+
+
+def getNormalizedPosition(glyph, position, fallbackHeight=None):
+    # Return the position relative to the glyph's advance width and bounding
+    # box height, so anchors of glyphs of different size can be compared
+    x, y = position
+    metrics = getGlyphMetrics(glyph)
+    if metrics.width:
+        nx = x / metrics.width
+    else:
+        nx = 0.5
+    bounds = metrics.bounds
+    if bounds is None:
+        yMin = 0
+        yMax = fallbackHeight
+    else:
+        yMin = bounds[1]
+        yMax = bounds[3]
+    if yMax is not None and yMax != yMin:
+        ny = (y - yMin) / (yMax - yMin)
+    else:
+        ny = 0.5
+    return nx, ny
+
+
+class AnchorNameStats(object):
+    # Running mean and variance of the normalized positions of one anchor
+    # name
+
+    def __init__(self):
+        self.count = 0
+        self.sum = [0, 0]
+        self.sumSquares = [0, 0]
+
+    def add(self, normalizedPosition):
+        self.count += 1
+        for i in (0, 1):
+            self.sum[i] += normalizedPosition[i]
+            self.sumSquares[i] += normalizedPosition[i] ** 2
+
+    def getScore(self, normalizedPosition):
+        # Log likelihood of the position under a normal distribution per
+        # axis, weighted by how often the anchor name occurs in the font
+        score = log(self.count)
+        for i in (0, 1):
+            mean = self.sum[i] / self.count
+            variance = max(
+                self.sumSquares[i] / self.count - mean**2, minVariance
+            )
+            score -= (normalizedPosition[i] - mean) ** 2 / (
+                2 * variance
+            ) + 0.5 * log(variance)
+        return score
+
+
+class AnchorNameModel(object):
+    # Statistics about where each base anchor name is typically placed in a
+    # font, built from the anchor index of a FontAnchors object. Used to
+    # guess the name of a new anchor from its position.
+
+    def __init__(self, fontAnchors):
+        self.fontAnchors = fontAnchors
+        self.stats = {}
+        font = fontAnchors.font
+        if font is None:
+            self.fallbackHeight = None
+        else:
+            self.fallbackHeight = font.info.capHeight
+            for name, glyphNames in fontAnchors.anchorGlyphs.items():
+                for glyphName in glyphNames:
+                    self.addSample(
+                        font[glyphName],
+                        name,
+                        fontAnchors.anchorPositions[glyphName, name],
+                    )
+
+    def addSample(self, glyph, name, position):
+        if name.startswith("_"):
+            # Mark anchors are placed by different rules, leave them out
+            return
+        if name not in self.stats:
+            self.stats[name] = AnchorNameStats()
+        self.stats[name].add(
+            getNormalizedPosition(glyph, position, self.fallbackHeight)
+        )
+
+    def guessName(self, glyph, position):
+        # Return the most likely anchor name for the position, or None if
+        # there are no anchors in the font yet
+        if not self.stats:
+            return None
+        normalizedPosition = getNormalizedPosition(
+            glyph, position, self.fallbackHeight
+        )
+        return max(
+            self.stats,
+            key=lambda name: self.stats[name].getScore(normalizedPosition),
+        )
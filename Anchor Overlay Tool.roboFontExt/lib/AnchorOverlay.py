@@ -12,9 +12,12 @@
 
 import vanilla
 
+from AppKit import NSAffineTransform, NSBezierPath, NSColor
+
 # from time import time
 
 from defconAppKit.windows.baseWindow import BaseWindowController
+from PyObjCTools.AppHelper import callLater
 
 from mojo.events import addObserver, removeObserver
 from mojo.drawingTools import (
@@ -28,11 +31,23 @@ from mojo.drawingTools import (
 from mojo.roboFont import CurrentFont, CurrentGlyph
 
 from lib.tools.defaults import getDefaultColor
-from mojo.UI import UpdateCurrentGlyphView, CurrentGlyphWindow
-from mojo.extensions import getExtensionDefault, setExtensionDefault
+from mojo.UI import UpdateCurrentGlyphView, CurrentGlyphWindow, GetFile
 
-from extensionID import extensionID
+from extensionSettings import extensionSettings
+from CoalescedCall import CoalescedCall
+from DrawPlan import getDrawPlan
+from EditTransaction import EditTransaction
 from FontAnchors import FontAnchors
+from GlyphFileWatcher import GlyphFileWatcher, updateFromDisk
+from GlyphGeometry import getGlyphMetrics, getPointBounds
+from GlyphVersion import getGlyphVersion
+from InterpolationPreview import InterpolationPreview
+
+
+defaultFillColor = (0.2, 0, 0.2, 0.2)
+
+# Seconds between checks for glyph files changed by other applications
+fileWatchInterval = 2.0
 
 
 def roundCoordinates(coordinatesTuple):
@@ -42,16 +57,24 @@ def roundCoordinates(coordinatesTuple):
 class AnchorOverlay(BaseWindowController):
     def __init__(self):
         self.fontAnchors = FontAnchors(CurrentFont())
-        self.showPreview = getExtensionDefault(
-            "%s.%s" % (extensionID, "preview"), True
-        )
-        nscolor = getDefaultColor("glyphViewPreviewFillColor")
-        self.preview_color = (
-            nscolor.redComponent(),
-            nscolor.greenComponent(),
-            nscolor.blueComponent(),
-            nscolor.alphaComponent(),
-        )
+        self.redraw = CoalescedCall(UpdateCurrentGlyphView)
+        # Last known checkbox state of each list row, used to find the rows
+        # that were actually changed in an edit callback
+        self._shownRows = {"anchor": {}, "glyph": {}, "mark": {}}
+        # Interpolated anchor positions to preview instead of the positions
+        # in the current font, see setInterpolation
+        self.interpolatedAnchors = None
+        self.location = None
+        self.interpolationPreview = None
+        # Cached overlay paths for inactive glyph windows, by glyph name
+        self._snapshots = {}
+        self.preview_color = self._getPreviewColor()
+        # Watches the UFO for glyphs changed by other applications. It stays
+        # open while the panel is hidden, and the changes it collected are
+        # picked up when the panel is shown again.
+        self.fileWatcher = None
+        self._fileWatchPath = None
+        self._fileWatchGeneration = 0
 
         columnDescriptions = [
             {"title": "Show", "cell": vanilla.CheckBoxListCell(), "width": 35},
@@ -59,7 +82,7 @@ class AnchorOverlay(BaseWindowController):
         ]
 
         self.w = vanilla.FloatingWindow(
-            (170, 490), "Anchor Overlay", closable=False
+            (170, 520), "Anchor Overlay", closable=False
         )
 
         y = 10
@@ -67,9 +90,11 @@ class AnchorOverlay(BaseWindowController):
             (10, y, -10, 20), "Show anchors:", sizeStyle="small"
         )
         y += 25
+        anchorNames = self.fontAnchors.getAnchorNames()
+        self._rememberRows("anchor", anchorNames)
         self.w.showAnchors = vanilla.List(
             (10, y, -10, 150),
-            self.fontAnchors.getAnchorNames(),
+            anchorNames,
             columnDescriptions=columnDescriptions,
             drawFocusRing=True,
             editCallback=self.updateAnchorVisibility,
@@ -142,45 +167,167 @@ class AnchorOverlay(BaseWindowController):
             sizeStyle="small",
         )
 
+        y += 30
+        self.w.interpolationButton = vanilla.Button(
+            (10, y, 150, 25),
+            "Preview Location…",
+            callback=self.openInterpolationPreview,
+            sizeStyle="small",
+        )
+
         self.setUpBaseWindowBehavior()
         self.addObservers()
+        self.startFileWatcher()
 
         self.w.showAnchors.setSelection([])
         self.w.open()
 
+    # The panel is hidden instead of closed when the tool is deactivated,
+    # and synced with the font when it is shown again
+
+    def show(self):
+        font = CurrentFont()
+        if font is not self.fontAnchors.font and (
+            font is None
+            or self.fontAnchors.font is None
+            or font.naked() is not self.fontAnchors.font.naked()
+        ):
+            # Changes collected for the previous font don't apply
+            self.stopFileWatcher()
+            hideSets = self.fontAnchors.hideSets
+            self.fontAnchors = FontAnchors(font)
+            self.fontAnchors.hideSets = hideSets
+            self._snapshots = {}
+            self.updateAnchorList()
+        elif font is not None and self.fontAnchors.sync():
+            self.updateAnchorList()
+        self.addObservers()
+        self.startFileWatcher()
+        self.w.show()
+
+    def hide(self):
+        self.closeInterpolationPreview()
+        self.redraw.cancel()
+        self.removeObservers()
+        self.pauseFileWatcher()
+        self.saveSettings()
+        self.w.hide()
+        UpdateCurrentGlyphView()
+
+    def updateAnchorList(self):
+        anchorNames = self.fontAnchors.getAnchorNames()
+        self._rememberRows("anchor", anchorNames)
+        self.w.showAnchors.set(anchorNames)
+        self.w.showAnchors.setSelection([])
+        self._rememberRows("mark", [])
+        self.w.markAnchors.set([])
+
     # Observers
 
     def addObservers(self):
         addObserver(self, "glyphChanged", "draw")
         addObserver(self, "glyphChangedPreview", "drawPreview")
-        addObserver(self, "glyphChanged", "drawInactive")
+        addObserver(self, "glyphChangedInactive", "drawInactive")
+        addObserver(self, "preferencesChanged", "preferencesChanged")
 
     def removeObservers(self):
         removeObserver(self, "draw")
         removeObserver(self, "drawPreview")
         removeObserver(self, "drawInactive")
+        removeObserver(self, "preferencesChanged")
+
+    def preferencesChanged(self, info):
+        self.preview_color = self._getPreviewColor()
+
+    # Glyphs changed on disk
+
+    def startFileWatcher(self):
+        font = self.fontAnchors.font
+        path = font.path if font is not None else None
+        if self.fileWatcher is not None and path == self._fileWatchPath:
+            # Still watching the same UFO, check what changed while the
+            # panel was hidden right away
+            self.pauseFileWatcher()
+            self._checkFiles(self._fileWatchGeneration)
+            return
+        self.stopFileWatcher()
+        if not path:
+            return
+        self.fileWatcher = GlyphFileWatcher(path)
+        self._fileWatchPath = path
+        # Saves are observed as long as the watcher is open, also while the
+        # panel is hidden
+        addObserver(self, "fontDidSave", "fontDidSave")
+        self._scheduleFileCheck()
+
+    def pauseFileWatcher(self):
+        # Stop checking for changes, but keep the watcher open so it keeps
+        # collecting events. Pending checks are ignored.
+        self._fileWatchGeneration += 1
+
+    def stopFileWatcher(self):
+        self.pauseFileWatcher()
+        if self.fileWatcher is not None:
+            self.fileWatcher.close()
+            self.fileWatcher = None
+            self._fileWatchPath = None
+            removeObserver(self, "fontDidSave")
+
+    def fontDidSave(self, info):
+        # The files written by the save are not changes from outside
+        font = self.fontAnchors.font
+        if (
+            self.fileWatcher is not None
+            and font is not None
+            and info["font"].naked() is font.naked()
+        ):
+            self.fileWatcher.ignoreOwnChanges()
+
+    def _scheduleFileCheck(self):
+        callLater(
+            fileWatchInterval, self._checkFiles, self._fileWatchGeneration
+        )
+
+    def _checkFiles(self, generation):
+        if generation != self._fileWatchGeneration or self.fileWatcher is None:
+            return
+        glyphNames = self.fileWatcher.getChangedGlyphNames()
+        if glyphNames:
+            updateFromDisk(self.fontAnchors, glyphNames)
+            self.updateAnchorList()
+            self.redraw.schedule()
+        self._scheduleFileCheck()
 
     # Callbacks
 
+    def _rememberRows(self, kind, rows):
+        self._shownRows[kind] = {row["Name"]: row["Show"] for row in rows}
+
+    def _updateVisibility(self, kind, rows, includeMatching=True):
+        # Only touch the rows whose checkbox state has changed since the last
+        # call, and merge the resulting redraws into one
+        shownRows = self._shownRows[kind]
+        changed = False
+        for row in rows:
+            name = row["Name"]
+            isVisible = bool(row["Show"])
+            if shownRows.get(name) != isVisible:
+                shownRows[name] = isVisible
+                self.fontAnchors.setVisibility(
+                    kind, name, isVisible, includeMatching
+                )
+                changed = True
+        if changed:
+            self.redraw.schedule()
+
     def updateAnchorVisibility(self, sender=None, glyph=None):
-        for anchor in sender.get():
-            # self.fontAnchors.setAnchorVisibility(anchor["Name"], anchor["Show"])
-            self.fontAnchors.setVisibility(
-                "anchor", anchor["Name"], anchor["Show"]
-            )
-        UpdateCurrentGlyphView()
+        self._updateVisibility("anchor", sender.get())
 
     def updateGlyphVisibility(self, sender=None, glyph=None):
-        for g in sender.get():
-            self.fontAnchors.setVisibility(
-                "glyph", g["Name"], g["Show"], False
-            )
-        UpdateCurrentGlyphView()
+        self._updateVisibility("glyph", sender.get(), False)
 
     def updateMarkVisibility(self, sender=None, glyph=None):
-        for g in sender.get():
-            self.fontAnchors.setVisibility("mark", g["Name"], g["Show"], False)
-        UpdateCurrentGlyphView()
+        self._updateVisibility("mark", sender.get(), False)
 
     def updateAnchoredGlyphsList(self, sender=None, glyph=None):
         selectedAnchorNames = []
@@ -188,11 +335,11 @@ class AnchorOverlay(BaseWindowController):
             selectedAnchorNames.append(
                 self.fontAnchors.getAnchorNames()[i]["Name"]
             )
-        self.w.markAnchors.set(
-            self.fontAnchors.getAnchoredGlyphNamesForList(
-                selectedAnchorNames, marks=True
-            )
+        markNames = self.fontAnchors.getAnchoredGlyphNamesForList(
+            selectedAnchorNames, marks=True
         )
+        self._rememberRows("mark", markNames)
+        self.w.markAnchors.set(markNames)
 
     def gotoGlyph(self, sender=None, glyph=None):
         newGlyphName = sender.get()[sender.getSelection()[0]]["Name"]
@@ -203,6 +350,41 @@ class AnchorOverlay(BaseWindowController):
         anchorName = sender.get()[sender.getSelection()[0]]["Name"]
         self.fontAnchors.selectGlyphsWithAnchorName(anchorName)
 
+    def openInterpolationPreview(self, sender=None):
+        path = GetFile(
+            "Choose the designspace file", fileTypes=["designspace"]
+        )
+        if path is not None:
+            self.closeInterpolationPreview()
+            self.interpolationPreview = InterpolationPreview(self, path)
+
+    def closeInterpolationPreview(self):
+        if self.interpolationPreview is not None:
+            self.interpolationPreview.w.close()
+            self.interpolationPreview = None
+
+    def setInterpolation(self, interpolatedAnchors, location=None):
+        # Preview the anchor positions at a designspace location. Pass None
+        # to go back to the positions in the current font.
+        self.interpolatedAnchors = interpolatedAnchors
+        self.location = location
+        if interpolatedAnchors is None:
+            self.interpolationPreview = None
+        self.redraw.schedule()
+
+    def getAnchorPosition(self, glyphName, anchorName, position=None):
+        # Return the anchor position to use for drawing. Anchors that can't
+        # be interpolated fall back to their position in the current font.
+        if self.interpolatedAnchors is not None:
+            interpolated = self.interpolatedAnchors.getAnchorPosition(
+                glyphName, anchorName, self.location
+            )
+            if interpolated is not None:
+                return interpolated
+        if position is None:
+            position = self.fontAnchors.anchorPositions[glyphName, anchorName]
+        return position
+
     # def setShowPreview(self, sender=None, glyph=None):
     #    self.showPreview = sender.get()
 
@@ -212,31 +394,24 @@ class AnchorOverlay(BaseWindowController):
 
     # Drawing helpers
 
+    def _getPreviewColor(self):
+        nscolor = getDefaultColor("glyphViewPreviewFillColor")
+        return (
+            nscolor.redComponent(),
+            nscolor.greenComponent(),
+            nscolor.blueComponent(),
+            nscolor.alphaComponent(),
+        )
+
     def setStroke(self, value=0.5):
         strokeWidth(value)
 
-    def setFill(self, rgba=(0.2, 0, 0.2, 0.2)):
+    def setFill(self, rgba=defaultFillColor):
         r, g, b, a = rgba
         fill(r, g, b, a)
 
     # Stuff for anchor alignment buttons
 
-    def _getBBox(self, pointList):
-        minX = None
-        maxX = None
-        minY = None
-        maxY = None
-        for p in pointList:
-            if minX is None or p.x < minX:
-                minX = p.x
-            if maxX is None or p.x > maxX:
-                maxX = p.x
-            if minY is None or p.y < minY:
-                minY = p.y
-            if maxY is None or p.y > maxY:
-                maxY = p.y
-        return ((minX, minY), (maxX, maxY))
-
     def _getReferencePoint(self, glyph):
         # calculate a reference point for anchor adjustments
         if len(glyph.selection) == 0:
@@ -245,7 +420,10 @@ class AnchorOverlay(BaseWindowController):
             # TODO: x-height for lowercase?
             # print("Ref: metrics")
             return roundCoordinates(
-                (glyph.width / 2, self.fontAnchors.font.info.capHeight / 2)
+                (
+                    getGlyphMetrics(glyph).width / 2,
+                    self.fontAnchors.font.info.capHeight / 2,
+                )
             )
         elif len(glyph.selection) == 1:
             # one point is selected, return same
@@ -256,66 +434,56 @@ class AnchorOverlay(BaseWindowController):
         else:
             # more points are selected, find min/max and return center.
             # print("Ref: bbox")
-            ((minX, minY), (maxX, maxY)) = self._getBBox(glyph.selection)
+            minX, minY, maxX, maxY = getPointBounds(
+                [(p.x, p.y) for p in glyph.selection]
+            )
             return roundCoordinates(((minX + maxX) / 2, (minY + maxY) / 2))
 
     # Align anchors based on selection
 
-    def centerAnchorX(self, sender=None, glyph=None):
+    def _alignSelectedAnchors(self, title, x=None, y=None):
         g = CurrentGlyph()
-        g.prepareUndo(undoTitle="h-align anchors in /%s" % g.name)
-        p = self._getReferencePoint(g)
-        for a in g.anchors:
-            if a.selected:
-                a.x = p[0]
-        g.performUndo()
-        UpdateCurrentGlyphView()
+        with EditTransaction(
+            g.font, "%s in /%s" % (title, g.name), self.redraw.schedule
+        ) as transaction:
+            glyph = transaction.addGlyph(g)
+            for a in glyph.anchors:
+                if a.selected:
+                    if x is not None:
+                        a.x = x
+                    if y is not None:
+                        a.y = y
+
+    def centerAnchorX(self, sender=None, glyph=None):
+        p = self._getReferencePoint(CurrentGlyph())
+        self._alignSelectedAnchors("h-align anchors", x=p[0])
 
     def centerAnchorY(self, sender=None, glyph=None):
-        g = CurrentGlyph()
-        g.prepareUndo(undoTitle="v-align anchors in /%s" % g.name)
-        p = self._getReferencePoint(g)
-        for a in g.anchors:
-            if a.selected:
-                a.y = p[1]
-        g.performUndo()
-        UpdateCurrentGlyphView()
+        p = self._getReferencePoint(CurrentGlyph())
+        self._alignSelectedAnchors("v-align anchors", y=p[1])
 
     def addAnchorAndUpdateList(self, glyph, name, position):
         self.fontAnchors.addAnchor(glyph, name, position, addToGlyph=True)
-        self.w.showAnchors.set(self.fontAnchors.getAnchorNames())
-        UpdateCurrentGlyphView()
+        anchorNames = self.fontAnchors.getAnchorNames()
+        self._rememberRows("anchor", anchorNames)
+        self.w.showAnchors.set(anchorNames)
+        self.redraw.schedule()
 
     # Align anchors based on metrics
 
     def moveAnchorBaseline(self, sender=None, glyph=None):
-        g = CurrentGlyph()
-        g.prepareUndo(undoTitle="align anchors to baseline in /%s" % g.name)
-        for a in g.anchors:
-            if a.selected:
-                a.y = 0
-        g.performUndo()
-        UpdateCurrentGlyphView()
+        self._alignSelectedAnchors("align anchors to baseline", y=0)
 
     def moveAnchorXheight(self, sender=None, glyph=None):
-        g = CurrentGlyph()
-        g.prepareUndo(undoTitle="align anchors to x-height in /%s" % g.name)
-        y = self.fontAnchors.font.info.xHeight
-        for a in g.anchors:
-            if a.selected:
-                a.y = y
-        g.performUndo()
-        UpdateCurrentGlyphView()
+        self._alignSelectedAnchors(
+            "align anchors to x-height", y=self.fontAnchors.font.info.xHeight
+        )
 
     def moveAnchorCapheight(self, sender=None, glyph=None):
-        g = CurrentGlyph()
-        g.prepareUndo(undoTitle="align anchors to cap height in /%s" % g.name)
-        y = self.fontAnchors.font.info.capHeight
-        for a in g.anchors:
-            if a.selected:
-                a.y = y
-        g.performUndo()
-        UpdateCurrentGlyphView()
+        self._alignSelectedAnchors(
+            "align anchors to cap height",
+            y=self.fontAnchors.font.info.capHeight,
+        )
 
     def glyphChanged(self, info):
         # print("  * glyphChanged")
@@ -324,6 +492,12 @@ class AnchorOverlay(BaseWindowController):
             if len(g.anchors) > 0:
                 self.drawAnchoredGlyphs(g)
 
+    def glyphChangedInactive(self, info):
+        g = info["glyph"]
+        if g is not None:
+            if len(g.anchors) > 0:
+                self.drawOverlaySnapshot(g)
+
     def glyphChangedPreview(self, info):
         # print("  * glyphChangedPreview")
         g = info["glyph"]
@@ -331,62 +505,130 @@ class AnchorOverlay(BaseWindowController):
             if len(g.anchors) > 0:
                 self.drawAnchoredGlyphs(g, preview=True)
 
+    def getDrawPlan(self, glyph):
+        # Return a list of (glyph name, x offset, y offset) for all visible
+        # glyphs attached to the anchors of the glyph
+        return getDrawPlan(self.fontAnchors, glyph, self.getAnchorPosition)
+
+    # Overlay snapshots for inactive glyph windows
+
+    def _isSameKey(self, key, other):
+        # Keys may contain glyph version objects, which are compared by
+        # identity
+        return len(key) == len(other) and all(
+            a is b or a == b for a, b in zip(key, other)
+        )
+
+    def _getSnapshotPath(self, plan):
+        # Combine the outlines of all glyphs in the draw plan into one path
+        path = NSBezierPath.bezierPath()
+        font = self.fontAnchors.font
+        for gn, dx, dy in plan:
+            glyphPath = (
+                font[gn]
+                .naked()
+                .getRepresentation("defconAppKit.NSBezierPath")
+                .copy()
+            )
+            transform = NSAffineTransform.transform()
+            transform.translateXBy_yBy_(dx, dy)
+            glyphPath.transformUsingAffineTransform_(transform)
+            path.appendBezierPath_(glyphPath)
+        return path
+
+    def getOverlaySnapshot(self, glyph):
+        # Return the overlay of the glyph as one path. The draw plan is only
+        # rebuilt when the glyph, the anchor index, the hidden names or the
+        # preview location have changed, and the path only when the plan or
+        # any of the drawn glyphs have changed.
+        location = self.location
+        if location is not None:
+            location = tuple(sorted(location.items()))
+        planKey = (
+            getGlyphVersion(glyph),
+            self.fontAnchors.version,
+            self.fontAnchors.hideVersion,
+            location,
+        )
+        snapshot = self._snapshots.get(glyph.name)
+        if snapshot is None or not self._isSameKey(
+            snapshot["planKey"], planKey
+        ):
+            snapshot = {
+                "planKey": planKey,
+                "plan": self.getDrawPlan(glyph),
+                "glyphsKey": None,
+                "path": None,
+            }
+            self._snapshots[glyph.name] = snapshot
+        font = self.fontAnchors.font
+        glyphsKey = tuple(
+            getGlyphVersion(font[gn]) for gn, _, _ in snapshot["plan"]
+        )
+        if snapshot["glyphsKey"] is None or not self._isSameKey(
+            snapshot["glyphsKey"], glyphsKey
+        ):
+            snapshot["glyphsKey"] = glyphsKey
+            snapshot["path"] = self._getSnapshotPath(snapshot["plan"])
+        return snapshot["path"]
+
+    def drawOverlaySnapshot(self, glyph):
+        path = self.getOverlaySnapshot(glyph)
+        if path.isEmpty():
+            return
+        NSColor.colorWithCalibratedRed_green_blue_alpha_(
+            *defaultFillColor
+        ).set()
+        path.fill()
+
+    def syncGlyph(self, glyph):
+        # Re-index the anchors of the glyph if it was edited since the last
+        # frame, e.g. an anchor was moved, so the marks and the interpolated
+        # positions follow the edit
+        self.fontAnchors.syncGlyph(glyph.name)
+        if self.interpolatedAnchors is not None:
+            self.interpolatedAnchors.updateGlyphs([glyph.name])
+
     def drawAnchoredGlyphs(self, glyph, preview=False):
+        self.syncGlyph(glyph)
+        plan = self.getDrawPlan(glyph)
+        if not plan:
+            return
+
+        # All glyphs share the same fill, so the graphics state is set up
+        # once per frame and only the translation changes between glyphs
+        save()
         self.setStroke(0)
         if preview:
             self.setFill(self.preview_color)
         else:
             self.setFill()
-
-        # start = time()
-
-        dbx = 0
-        dby = 0
-
-        for a in glyph.anchors:
-            anchor_name = a.name
-            # print("     %s" % anchor_name)
-            if self.fontAnchors.getVisibility("anchor", anchor_name):
-                glyphsToDraw = self.fontAnchors.getAnchoredGlyphNames(
-                    anchor_name
-                )
-                # get translation for base anchor
-                dbx = a.x
-                dby = a.y
-                save()
-                for gn in glyphsToDraw:
-                    if (
-                        anchor_name[0] != "_"
-                        and self.fontAnchors.getVisibility("mark", gn, False)
-                    ) or (
-                        anchor_name[0] == "_"
-                        and self.fontAnchors.getVisibility("glyph", gn, False)
-                    ):
-                        # get translation for current mark anchor
-                        dmx, dmy = self.fontAnchors.anchorPositions[
-                            gn,
-                            self.fontAnchors.getMatchingAnchorName(
-                                anchor_name
-                            ),
-                        ]
-                        x = dbx - dmx
-                        y = dby - dmy
-                        translate(x, y)
-                        drawGlyph(self.fontAnchors.font[gn])
-                        dbx = dmx
-                        dby = dmy
-                restore()
-
-        # stop = time()
-        # print("     Draw: %0.1f ms" % (1000 * (stop - start)))
+        x = 0
+        y = 0
+        font = self.fontAnchors.font
+        for gn, dx, dy in plan:
+            translate(dx - x, dy - y)
+            drawGlyph(font[gn])
+            x = dx
+            y = dy
+        restore()
+
+    @property
+    def showPreview(self):
+        return extensionSettings.get("preview")
+
+    def saveSettings(self):
+        # Written to the defaults only if the hidden names have changed
+        extensionSettings.set("hide", self.fontAnchors.hideLists)
 
     def windowCloseCallback(self, sender):
+        self.closeInterpolationPreview()
+        self.redraw.cancel()
+        self._snapshots = {}
         self.removeObservers()
-        setExtensionDefault(
-            "%s.%s" % (extensionID, "hide"), self.fontAnchors.hideLists
-        )
-        setExtensionDefault(
-            "%s.%s" % (extensionID, "preview"), self.showPreview
-        )
+        self.stopFileWatcher()
+        self.saveSettings()
+        # Don't wait for the debounced write when the window goes away
+        extensionSettings.flush()
         super(AnchorOverlay, self).windowCloseCallback(sender)
         UpdateCurrentGlyphView()
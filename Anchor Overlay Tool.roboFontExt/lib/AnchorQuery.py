@@ -0,0 +1,133 @@
+from bisect import bisect_left, bisect_right
+from fnmatch import fnmatchcase
+
+
+wildcardCharacters = "*?["
+
+
+def isPattern(name):
+    return any(c in name for c in wildcardCharacters)
+
+
+def getLiteralPrefix(pattern):
+    # The part of a name pattern before the first wildcard character
+    for i, c in enumerate(pattern):
+        if c in wildcardCharacters:
+            return pattern[:i]
+    return pattern
+
+
+class AnchorQuery(object):
+    # Indexed queries on the anchors collected by a FontAnchors object.
+    #
+    # Examples:
+    #     query = fontAnchors.getQuery()
+    #     query.getAnchorNames("top*")
+    #     query.getGlyphsWithAnchor("top", minY=font.info.capHeight + 50)
+    #     query.getGlyphsLackingAnchor("_bottom", query.getMarkGlyphNames())
+    #
+    # Anchor names may be exact names or shell-style patterns. The indexes
+    # are built lazily and rebuilt when the FontAnchors object has changed.
+
+    def __init__(self, fontAnchors):
+        self.fontAnchors = fontAnchors
+        self._version = None
+        self._sortedAnchorNames = []
+        self._coordinateIndex = {}
+
+    def _update(self):
+        if self._version == self.fontAnchors.version:
+            return
+        self._sortedAnchorNames = sorted(self.fontAnchors.anchorGlyphs.keys())
+        self._coordinateIndex = {}
+        self._version = self.fontAnchors.version
+
+    def _getCoordinateIndex(self, anchorName, axis):
+        # Sorted coordinates of one anchor name along one axis (0 = x,
+        # 1 = y), plus the glyph names in the same order
+        key = (anchorName, axis)
+        if key not in self._coordinateIndex:
+            positions = self.fontAnchors.anchorPositions
+            entries = sorted(
+                (positions[glyphName, anchorName][axis], glyphName)
+                for glyphName in self.fontAnchors.anchorGlyphs.get(
+                    anchorName, []
+                )
+            )
+            self._coordinateIndex[key] = (
+                [e[0] for e in entries],
+                [e[1] for e in entries],
+            )
+        return self._coordinateIndex[key]
+
+    def _getGlyphsInRange(self, anchorName, axis, minValue, maxValue):
+        values, glyphNames = self._getCoordinateIndex(anchorName, axis)
+        if minValue is None:
+            start = 0
+        else:
+            start = bisect_left(values, minValue)
+        if maxValue is None:
+            end = len(values)
+        else:
+            end = bisect_right(values, maxValue)
+        return glyphNames[start:end]
+
+    def getAnchorNames(self, pattern="*"):
+        # Return all anchor names in the font that match the pattern
+        self._update()
+        if not isPattern(pattern):
+            if pattern in self.fontAnchors.anchorGlyphs:
+                return [pattern]
+            return []
+        prefix = getLiteralPrefix(pattern)
+        names = self._sortedAnchorNames
+        result = []
+        for i in range(bisect_left(names, prefix), len(names)):
+            name = names[i]
+            if not name.startswith(prefix):
+                break
+            if fnmatchcase(name, pattern):
+                result.append(name)
+        return result
+
+    def getGlyphsWithAnchor(
+        self, pattern, minX=None, maxX=None, minY=None, maxY=None
+    ):
+        # Return the sorted names of glyphs that have an anchor matching the
+        # pattern, optionally only if the anchor lies within the given
+        # coordinate range (inclusive)
+        glyphNames = set()
+        for anchorName in self.getAnchorNames(pattern):
+            if minX is None and maxX is None and minY is None and maxY is None:
+                glyphNames.update(self.fontAnchors.anchorGlyphs[anchorName])
+                continue
+            candidates = None
+            if minX is not None or maxX is not None:
+                candidates = set(
+                    self._getGlyphsInRange(anchorName, 0, minX, maxX)
+                )
+            if minY is not None or maxY is not None:
+                inRange = self._getGlyphsInRange(anchorName, 1, minY, maxY)
+                if candidates is None:
+                    candidates = set(inRange)
+                else:
+                    candidates.intersection_update(inRange)
+            glyphNames.update(candidates)
+        return sorted(glyphNames)
+
+    def getGlyphsLackingAnchor(self, pattern, glyphNames=None):
+        # Return the sorted names of glyphs that don't have any anchor
+        # matching the pattern. If no glyph names are given, all glyphs with
+        # anchors are considered.
+        if glyphNames is None:
+            glyphNames = self.getGlyphsWithAnchor("*")
+        withAnchor = set(self.getGlyphsWithAnchor(pattern))
+        return sorted(set(glyphNames) - withAnchor)
+
+    def getMarkGlyphNames(self):
+        # Glyphs with at least one mark anchor, i.e. an underscore anchor
+        return self.getGlyphsWithAnchor("_*")
+
+    def getBaseGlyphNames(self):
+        # Glyphs with at least one base anchor
+        return self.getGlyphsWithAnchor("[!_]*")
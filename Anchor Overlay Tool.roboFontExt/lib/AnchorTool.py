@@ -9,16 +9,14 @@ from lib.tools.defaults import getDefaultColor
 from mojo.events import BaseEventTool
 from mojo.roboFont import CurrentGlyph
 
-from AnchorOverlay import AnchorOverlay
+# The overlay, the anchor index and the snapping code are only imported
+# when the tool is first activated, so installing the tool at RoboFont's
+# startup only costs the imports above.
 
 
 iconpath = join(dirname(__file__), "toolbarToolsAnchor.pdf")
 
-if isfile(iconpath):
-    toolbarIcon = NSImage.alloc().initByReferencingFile_(iconpath)
-else:
-    toolbarIcon = None
-    print("Warning: Toolbar icon not found: <%s>" % iconpath)
+toolbarIcon = None
 
 
 class AnchorTool(BaseEventTool):
@@ -26,8 +24,15 @@ class AnchorTool(BaseEventTool):
         self.pStart = None
         self.pEnd = None
         self._selectedMouseDownPoint = None
+        self.anchorOverlayUI = None
 
     def getToolbarIcon(self):
+        global toolbarIcon
+        if toolbarIcon is None:
+            if isfile(iconpath):
+                toolbarIcon = NSImage.alloc().initByReferencingFile_(iconpath)
+            else:
+                print("Warning: Toolbar icon not found: <%s>" % iconpath)
         return toolbarIcon
 
     def getToolbarTip(self):
@@ -35,12 +40,17 @@ class AnchorTool(BaseEventTool):
 
     def becomeActive(self):
         # print("becomeActive")
-        self.anchorOverlayUI = AnchorOverlay()
+        # The panel is built once and then only shown and hidden
+        if self.anchorOverlayUI is None:
+            from AnchorOverlay import AnchorOverlay
+
+            self.anchorOverlayUI = AnchorOverlay()
+        else:
+            self.anchorOverlayUI.show()
 
     def becomeInactive(self):
         # print("becomeInactive")
-        self.anchorOverlayUI.windowCloseCallback(None)
-        self.anchorOverlayUI.w.close()
+        self.anchorOverlayUI.hide()
 
     def keyDown(self, event):
         # align via key commands
@@ -71,13 +81,33 @@ class AnchorTool(BaseEventTool):
         if d != (0, 0):
             # d = roundCoordinates(d)
             g = CurrentGlyph()
+            selected = [a for a in g.anchors if a.selected]
             g.prepareUndo(undoTitle="Move anchors in /%s" % g.name)
-            for a in g.anchors:
-                if a.selected:
+            if len(selected) == 1 and not self.optionDown:
+                # A single anchor stops at outline features and metrics on
+                # its way
+                self._moveAnchorWithSnapping(g, selected[0], d)
+            else:
+                for a in selected:
                     a.x = int(round(a.x)) + d[0]
                     a.y = int(round(a.y)) + d[1]
             g.performUndo()
 
+    def _moveAnchorWithSnapping(self, glyph, anchor, d):
+        from SnapTargets import getSnappedValue, getSnapTargets
+
+        targets = getSnapTargets(glyph)
+        x = int(round(anchor.x))
+        y = int(round(anchor.y))
+        if d[0]:
+            anchor.x = getSnappedValue(targets.x, x, d[0])
+        if d[1]:
+            info = glyph.font.info
+            yTargets = sorted(
+                set(targets.y) | {0, info.xHeight or 0, info.capHeight or 0}
+            )
+            anchor.y = getSnappedValue(yTargets, y, d[1])
+
     def shouldShowMarqueRect(self):
         return True
 
@@ -85,25 +115,33 @@ class AnchorTool(BaseEventTool):
         return True
 
     def _guessAnchorName(self, glyph, p):
-        if p.x <= glyph.width // 3:
+        fontAnchors = self.anchorOverlayUI.fontAnchors
+        name = fontAnchors.getNameModel().guessName(glyph, (p.x, p.y))
+        if name is None:
+            # No anchors in the font yet, guess from the glyph dimensions
+            name = self._guessAnchorNameFromBox(glyph, p)
+        if fontAnchors.hasAnchor(glyph.name, name):
+            name += "Attach"
+        return name
+
+    def _guessAnchorNameFromBox(self, glyph, p):
+        from GlyphGeometry import getGlyphMetrics
+
+        metrics = getGlyphMetrics(glyph)
+        if p.x <= metrics.width // 3:
             horizontal = "Left"
-        elif p.x >= glyph.width * 2 // 3:
+        elif p.x >= metrics.width * 2 // 3:
             horizontal = "Right"
         else:
             horizontal = ""
-        if p.y <= glyph.box[2] // 3:
+        yMax = metrics.bounds[3] if metrics.bounds is not None else 0
+        if p.y <= yMax // 3:
             vertical = "bottom"
-        elif p.y >= glyph.box[2] * 2 // 3:
+        elif p.y >= yMax * 2 // 3:
             vertical = "top"
         else:
             vertical = "center"
-        name = vertical + horizontal
-        if (
-            glyph.name,
-            name,
-        ) in self.anchorOverlayUI.fontAnchors.anchorPositions.keys():
-            name += "Attach"
-        return name
+        return vertical + horizontal
 
     def _newAnchor(self, p):
         # Add an anchor at position p
@@ -0,0 +1,558 @@
+"""
+Replay a recorded Anchor Tool session without RoboFont and report how
+long each kind of event takes.
+
+The session is a JSON Lines file written by EventRecording. The events
+are sent to a real AnchorTool, which runs against stand-ins for the glyph
+view and for RoboFont's font objects. The stand-in font is read from a
+UFO with fontTools. The overlay's draw callbacks are replayed with the
+same draw plan as in RoboFont; only the drawing itself is skipped. After
+each event, the anchor index is updated for the edited glyph, like the
+overlay does. So the hit-testing, nudging, snapping, anchor naming, index
+update and draw plan code paths are measured, but not AppKit.
+
+From the command line, the exit code is 1 if the 95th percentile of any
+event type is slower than --max-ms, so the replay can gate a build:
+
+    python AnchorToolReplay.py --repeat 20 --max-ms 8 session.jsonl My.ufo
+
+Run the replay outside of RoboFont. It installs its own modules in place
+of the RoboFont modules that the tool imports.
+"""
+
+from importlib.util import find_spec
+from json import loads
+from math import ceil, hypot
+from time import perf_counter
+import sys
+import types
+
+
+# Modules replaced by stand-ins during the replay
+standInModuleNames = (
+    "AppKit",
+    "defcon",
+    "lib",
+    "lib.tools",
+    "lib.tools.bezierTools",
+    "lib.tools.defaults",
+    "mojo",
+    "mojo.events",
+    "mojo.roboFont",
+)
+
+percentiles = (50, 90, 95, 99)
+
+
+# Font objects
+
+
+class HeadlessAnchor(object):
+    def __init__(self, glyph, name, x, y):
+        self.glyph = glyph
+        self.name = name
+        self._x = x
+        self._y = y
+        self.selected = False
+
+    def _get_x(self):
+        return self._x
+
+    def _set_x(self, value):
+        self._x = value
+        self.glyph.changed("Glyph.AnchorsChanged")
+
+    x = property(_get_x, _set_x)
+
+    def _get_y(self):
+        return self._y
+
+    def _set_y(self, value):
+        self._y = value
+        self.glyph.changed("Glyph.AnchorsChanged")
+
+    y = property(_get_y, _set_y)
+
+    @property
+    def position(self):
+        return (self._x, self._y)
+
+
+class HeadlessPoint(object):
+    def __init__(self, x, y, segmentType=None):
+        self.x = x
+        self.y = y
+        self.segmentType = segmentType
+        self.selected = False
+
+
+class HeadlessContour(object):
+    def __init__(self, points):
+        self.points = points
+
+    def __iter__(self):
+        return iter(self.points)
+
+    def __len__(self):
+        return len(self.points)
+
+    @property
+    def onCurvePoints(self):
+        return [p for p in self.points if p.segmentType is not None]
+
+
+class HeadlessGlyph(object):
+    # Representation factories registered by the extension modules, by
+    # name: (factory, destructive notifications)
+    factories = {}
+
+    def __init__(self, font, name):
+        self.font = font
+        self.name = name
+        self.width = 0
+        self.unicodes = []
+        self._anchors = []
+        self.contours = []
+        self.components = []
+        self._representations = {}
+
+    @property
+    def unicode(self):
+        return self.unicodes[0] if self.unicodes else None
+
+    def _get_anchors(self):
+        return self._anchors
+
+    def _set_anchors(self, anchors):
+        # fontTools' glyph reader sets the anchors as dicts
+        self._anchors = [
+            HeadlessAnchor(self, a.get("name", ""), a["x"], a["y"])
+            for a in anchors
+        ]
+
+    anchors = property(_get_anchors, _set_anchors)
+
+    def __iter__(self):
+        return iter(self.contours)
+
+    def __len__(self):
+        return len(self.contours)
+
+    @property
+    def bounds(self):
+        points = [p for contour in self.contours for p in contour]
+        if not points:
+            return None
+        xs = [p.x for p in points]
+        ys = [p.y for p in points]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def naked(self):
+        return self
+
+    def getRepresentation(self, name):
+        if name not in self._representations:
+            factory = self.factories[name][0]
+            self._representations[name] = factory(self)
+        return self._representations[name]
+
+    def changed(self, notification="Glyph.Changed"):
+        # Throw away the representations that depend on the change, like
+        # defcon does
+        for name in list(self._representations):
+            destructive = self.factories[name][1]
+            if (
+                notification == "Glyph.Changed"
+                or "Glyph.Changed" in destructive
+                or notification in destructive
+            ):
+                del self._representations[name]
+
+    def appendAnchor(self, name, position):
+        self._anchors.append(HeadlessAnchor(self, name, *position))
+        self.changed("Glyph.AnchorsChanged")
+
+    def prepareUndo(self, undoTitle=None):
+        pass
+
+    def performUndo(self):
+        pass
+
+
+class HeadlessPointPen(object):
+    def __init__(self, glyph):
+        self.glyph = glyph
+        self._points = None
+
+    def beginPath(self, identifier=None, **kwargs):
+        self._points = []
+
+    def addPoint(
+        self, pt, segmentType=None, smooth=False, name=None, **kwargs
+    ):
+        self._points.append(HeadlessPoint(pt[0], pt[1], segmentType))
+
+    def endPath(self):
+        self.glyph.contours.append(HeadlessContour(self._points))
+        self._points = None
+
+    def addComponent(self, baseGlyphName, transformation, **kwargs):
+        self.glyph.components.append((baseGlyphName, transformation))
+
+
+class HeadlessInfo(object):
+    familyName = None
+    styleName = None
+    unitsPerEm = 1000
+    descender = None
+    xHeight = None
+    capHeight = None
+
+
+class HeadlessFont(object):
+    def __init__(self, path):
+        from fontTools.ufoLib import UFOReader
+
+        reader = UFOReader(path, validate=False)
+        self.path = path
+        self.info = HeadlessInfo()
+        reader.readInfo(self.info)
+        self.lib = reader.readLib()
+        self.selection = []
+        glyphSet = reader.getGlyphSet()
+        self.glyphOrder = self.lib.get(
+            "public.glyphOrder", sorted(glyphSet.keys())
+        )
+        self._glyphs = {}
+        for name in glyphSet.keys():
+            glyph = HeadlessGlyph(self, name)
+            glyphSet.readGlyph(name, glyph, HeadlessPointPen(glyph))
+            self._glyphs[name] = glyph
+        self.glyphOrder = [n for n in self.glyphOrder if n in self._glyphs]
+        self.glyphOrder += sorted(set(self._glyphs) - set(self.glyphOrder))
+
+    def __getitem__(self, name):
+        return self._glyphs[name]
+
+    def __contains__(self, name):
+        return name in self._glyphs
+
+    def __iter__(self):
+        return (self._glyphs[name] for name in self.glyphOrder)
+
+    def __len__(self):
+        return len(self._glyphs)
+
+    def keys(self):
+        return list(self._glyphs)
+
+    def naked(self):
+        return self
+
+
+# Glyph view and event objects
+
+
+class HeadlessEventPoint(object):
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class HeadlessKeyEvent(object):
+    def __init__(self, characters):
+        self._characters = characters
+
+    def characters(self):
+        return self._characters
+
+
+class HeadlessGlyphView(object):
+    def getGlyphViewOnCurvePointsSize(self, minSize=7):
+        return minSize
+
+
+class HeadlessSelection(object):
+    def __init__(self, tool):
+        self.tool = tool
+
+    def resetSelection(self):
+        glyph = self.tool._glyph
+        for contour in glyph:
+            for p in contour:
+                p.selected = False
+        for anchor in glyph.anchors:
+            anchor.selected = False
+
+    def addPoint(self, point, add=False, contour=None):
+        point.selected = True
+
+    def addAnchor(self, anchor, add=False):
+        anchor.selected = True
+
+
+class HeadlessEventTool(object):
+    # Stand-in for mojo.events.BaseEventTool
+
+    def __init__(self):
+        self.shiftDown = False
+        self.optionDown = False
+        self.arrowKeysDown = {
+            "up": False,
+            "down": False,
+            "left": False,
+            "right": False,
+        }
+        self._glyph = None
+        self._view = HeadlessGlyphView()
+        self.selection = HeadlessSelection(self)
+        self._dragging = False
+        self.setup()
+
+    def setup(self):
+        pass
+
+    def getGlyph(self):
+        return self._glyph
+
+    def isDragging(self):
+        return self._dragging
+
+    def getMarqueRect(self):
+        return None
+
+
+class HeadlessOverlay(object):
+    # Stand-in for AnchorOverlay with the real anchor index and draw plan
+
+    def __init__(self, font):
+        from FontAnchors import FontAnchors
+
+        self.fontAnchors = FontAnchors(font)
+        self.drawnGlyphs = 0
+
+    def glyphChanged(self, info):
+        g = info["glyph"]
+        if g is not None:
+            if len(g.anchors) > 0:
+                self.drawAnchoredGlyphs(g)
+
+    def syncGlyph(self, glyph):
+        # Same as AnchorOverlay.syncGlyph, without interpolation
+        self.fontAnchors.syncGlyph(glyph.name)
+
+    def drawAnchoredGlyphs(self, glyph):
+        from DrawPlan import getDrawPlan
+
+        self.syncGlyph(glyph)
+        font = self.fontAnchors.font
+        for gn, dx, dy in getDrawPlan(self.fontAnchors, glyph):
+            # Stands in for drawGlyph
+            for contour in font[gn]:
+                len(contour)
+            self.drawnGlyphs += 1
+
+    def addAnchorAndUpdateList(self, glyph, name, position):
+        self.fontAnchors.addAnchor(glyph, name, position, addToGlyph=True)
+
+    def centerAnchorX(self, sender=None, glyph=None):
+        # Alignment needs the overlay's UI, it isn't replayed
+        pass
+
+    def centerAnchorY(self, sender=None, glyph=None):
+        pass
+
+
+# Replay
+
+
+# The replay whose glyph and font CurrentGlyph and CurrentFont return
+currentReplay = None
+
+
+def installStandIns():
+    # Put the stand-in modules in place of the RoboFont modules, once
+    if getattr(sys.modules.get("mojo"), "isStandIn", False):
+        return
+    if find_spec("mojo") is not None:
+        raise RuntimeError("Run the replay outside of RoboFont.")
+
+    modules = {name: types.ModuleType(name) for name in standInModuleNames}
+
+    class Glyph(object):
+        pass
+
+    def registerRepresentationFactory(
+        cls, name, factory, destructiveNotifications=("Glyph.Changed",)
+    ):
+        HeadlessGlyph.factories[name] = (
+            factory,
+            tuple(destructiveNotifications),
+        )
+
+    modules["defcon"].Glyph = Glyph
+    modules[
+        "defcon"
+    ].registerRepresentationFactory = registerRepresentationFactory
+
+    class StandIn(object):
+        # Accepts any AppKit call used by the tool's own drawing
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: StandIn()
+
+    modules["AppKit"].NSBezierPath = StandIn()
+    modules["AppKit"].NSImage = StandIn()
+    modules[
+        "lib.tools.bezierTools"
+    ].distanceFromPointToPoint = lambda p1, p2: hypot(p1.x - p2.x, p1.y - p2.y)
+    modules["lib.tools.defaults"].getDefaultColor = lambda name: StandIn()
+    modules["lib"].tools = modules["lib.tools"]
+    modules["lib.tools"].bezierTools = modules["lib.tools.bezierTools"]
+    modules["lib.tools"].defaults = modules["lib.tools.defaults"]
+    modules["mojo.events"].BaseEventTool = HeadlessEventTool
+    modules["mojo.roboFont"].CurrentGlyph = lambda: currentReplay.tool._glyph
+    modules["mojo.roboFont"].CurrentFont = lambda: currentReplay.font
+    modules["mojo"].isStandIn = True
+    modules["mojo"].events = modules["mojo.events"]
+    modules["mojo"].roboFont = modules["mojo.roboFont"]
+    sys.modules.update(modules)
+
+
+def readSession(path):
+    with open(path, encoding="utf-8") as f:
+        return [loads(line) for line in f if line.strip()]
+
+
+def getPercentile(sortedValues, percentile):
+    # Nearest-rank percentile of a sorted list
+    index = max(0, int(ceil(percentile / 100 * len(sortedValues))) - 1)
+    return sortedValues[index]
+
+
+class AnchorToolReplay(object):
+    def __init__(self, ufoPath):
+        self.ufoPath = ufoPath
+        self.font = None
+        self.tool = None
+        self.overlay = None
+        installStandIns()
+        # durations in milliseconds per event type
+        self.durations = {}
+
+    def _setUp(self):
+        from AnchorTool import AnchorTool
+
+        global currentReplay
+        currentReplay = self
+        self.font = HeadlessFont(self.ufoPath)
+        self.tool = AnchorTool()
+        self.overlay = HeadlessOverlay(self.font)
+        self.tool.anchorOverlayUI = self.overlay
+
+    def _dispatch(self, event):
+        tool = self.tool
+        kind = event["type"]
+        if kind == "draw":
+            self.overlay.glyphChanged({"glyph": tool._glyph})
+            return
+        tool.shiftDown = event.get("shift", False)
+        tool.optionDown = event.get("option", False)
+        if kind == "keyDown":
+            tool.arrowKeysDown = dict(event.get("arrows", {}))
+            tool.keyDown(HeadlessKeyEvent(event.get("characters", "")))
+        else:
+            self._dispatchMouseEvent(event)
+        # In RoboFont, the overlay re-indexes the edited glyph on the next
+        # redraw, which follows every event
+        self.overlay.syncGlyph(tool._glyph)
+
+    def _dispatchMouseEvent(self, event):
+        tool = self.tool
+        kind = event["type"]
+        point = HeadlessEventPoint(*event["point"])
+        if kind == "mouseDown":
+            tool.mouseDown(point, event.get("clickCount", 1))
+        elif kind == "mouseDragged":
+            tool._dragging = True
+            tool.mouseDragged(point, HeadlessEventPoint(*event["delta"]))
+        elif kind == "mouseUp":
+            tool.mouseUp(point)
+            tool._dragging = False
+
+    def replay(self, events, repeat=1):
+        # Replay the events repeat times, each time on a freshly read font.
+        # Events for glyphs that are not in the font are skipped.
+        for _ in range(repeat):
+            self._setUp()
+            for event in events:
+                glyphName = event.get("glyph")
+                if glyphName not in self.font:
+                    continue
+                self.tool._glyph = self.font[glyphName]
+                start = perf_counter()
+                self._dispatch(event)
+                duration = (perf_counter() - start) * 1000
+                self.durations.setdefault(event["type"], []).append(duration)
+
+    def getStatistics(self):
+        # Return {event type: {"count": n, "p50": ms, ..., "max": ms}}
+        statistics = {}
+        for kind, durations in self.durations.items():
+            durations = sorted(durations)
+            stats = {"count": len(durations), "max": durations[-1]}
+            for percentile in percentiles:
+                stats["p%i" % percentile] = getPercentile(
+                    durations, percentile
+                )
+            statistics[kind] = stats
+        return statistics
+
+    def getReport(self):
+        lines = [
+            "%-14s %7s" % ("Event", "Count")
+            + "".join(" %8s" % ("p%i" % p) for p in percentiles)
+            + " %8s" % "max"
+        ]
+        for kind, stats in sorted(self.getStatistics().items()):
+            lines.append(
+                "%-14s %7i" % (kind, stats["count"])
+                + "".join(" %8.3f" % stats["p%i" % p] for p in percentiles)
+                + " %8.3f" % stats["max"]
+            )
+        return "\n".join(lines)
+
+
+def main(args=None):
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(
+        description="Replay a recorded Anchor Tool session and report the "
+        "latency per event type in milliseconds."
+    )
+    parser.add_argument("session", help="JSON Lines file from EventRecording")
+    parser.add_argument("ufo", metavar="UFO")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="Fail if the 95th percentile of any event type is slower",
+    )
+    options = parser.parse_args(args)
+    replay = AnchorToolReplay(options.ufo)
+    replay.replay(readSession(options.session), options.repeat)
+    print(replay.getReport())
+    if options.max_ms is not None:
+        slow = [
+            kind
+            for kind, stats in replay.getStatistics().items()
+            if stats["p95"] > options.max_ms
+        ]
+        if slow:
+            print("Slower than %g ms: %s" % (options.max_ms, ", ".join(slow)))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Compute and add anchors for many glyphs at once, based on the outline
+bounding box and the vertical font metrics.
+
+Works in RoboFont and headless on UFOs opened with fontParts:
+
+    from fontParts.world import OpenFont
+    from AutoAnchors import AutoAnchors
+
+    font = OpenFont("MyFont.ufo")
+    auto = AutoAnchors(font)
+    auto.apply(auto.compute(font.keys()))
+    font.save()
+"""
+
+from EditTransaction import EditTransaction
+from GlyphClassifier import getBaseName
+
+
+# Tolerance in font units when snapping outline extremes to font metrics,
+# to account for overshoots
+defaultOvershoot = 20
+
+
+def isMarkGlyphName(glyphname):
+    return getBaseName(glyphname).endswith("comb")
+
+
+def getOnCurveCoordinates(glyph):
+    # Return the x and y coordinates of all on-curve points as two lists
+    xs = []
+    ys = []
+    for contour in glyph.contours:
+        for p in contour.points:
+            if p.type != "offcurve":
+                xs.append(p.x)
+                ys.append(p.y)
+    return xs, ys
+
+
+class AutoAnchors(object):
+    def __init__(self, font, overshoot=defaultOvershoot):
+        self.font = font
+        self.overshoot = overshoot
+        info = font.info
+        self.xHeight = info.xHeight or 0
+        self.capHeight = info.capHeight or 0
+
+    # Reference values
+
+    def _snapTop(self, yMax):
+        # Return the lowest metric the outline top reaches, considering
+        # overshoot, or the outline top itself if it is above all metrics
+        for metric in sorted((self.xHeight, self.capHeight)):
+            if yMax <= metric + self.overshoot:
+                return metric
+        return yMax
+
+    def _snapBottom(self, yMin):
+        if yMin >= -self.overshoot:
+            return 0
+        return yMin
+
+    def _getMarkMetric(self, yMin):
+        # Height at which a top mark attaches to its base
+        if yMin >= self.capHeight - self.overshoot:
+            return self.capHeight
+        return self.xHeight
+
+    # Computation
+
+    def computeGlyph(self, glyph):
+        # Return a list of (name, (x, y)) for the anchors the glyph should
+        # have. Glyphs without outlines get no anchors.
+        xs, ys = getOnCurveCoordinates(glyph)
+        if not xs:
+            return []
+        xMin = min(xs)
+        xMax = max(xs)
+        yMin = min(ys)
+        yMax = max(ys)
+        x = int(round((xMin + xMax) / 2))
+        if isMarkGlyphName(glyph.name):
+            if (yMin + yMax) / 2 >= self.xHeight / 2:
+                # Mark above the base glyph, with a base anchor on top for
+                # stacking further marks
+                return [
+                    ("_top", (x, self._getMarkMetric(yMin))),
+                    ("top", (x, int(round(yMax)))),
+                ]
+            return [
+                ("_bottom", (x, 0)),
+                ("bottom", (x, int(round(yMin)))),
+            ]
+        return [
+            ("top", (x, int(round(self._snapTop(yMax))))),
+            ("bottom", (x, int(round(self._snapBottom(yMin))))),
+        ]
+
+    def compute(self, glyphNames):
+        # Return a dict of glyph name -> list of (name, (x, y))
+        result = {}
+        for glyphName in glyphNames:
+            if glyphName not in self.font:
+                continue
+            anchors = self.computeGlyph(self.font[glyphName])
+            if anchors:
+                result[glyphName] = anchors
+        return result
+
+    # Application
+
+    def apply(self, result, replace=False):
+        # Add the computed anchors to the glyphs. Existing anchors with the
+        # same name are left alone, unless replace is True. Returns the
+        # number of anchors that were added or moved. All glyphs are changed
+        # in one transaction, which is one undo step in RoboFont.
+        count = 0
+        with EditTransaction(
+            self.font, "Add anchors", groupUndo=True
+        ) as transaction:
+            for glyphName, anchors in sorted(result.items()):
+                existing = {a.name: a for a in self.font[glyphName].anchors}
+                changes = [
+                    (name, position)
+                    for name, position in anchors
+                    if name not in existing
+                    or (
+                        replace
+                        and (existing[name].x, existing[name].y) != position
+                    )
+                ]
+                if not changes:
+                    continue
+                glyph = transaction.getGlyph(glyphName)
+                for name, position in changes:
+                    if name in existing:
+                        existing[name].x, existing[name].y = position
+                    else:
+                        glyph.appendAnchor(name, position)
+                    count += 1
+        return count
@@ -0,0 +1,11 @@
+"""
+Check the anchors of all open fonts for consistency and print the issues.
+"""
+
+from AnchorLint import formatIssue, lintFonts
+
+
+issues = lintFonts(AllFonts())
+for issue in issues:
+    print(formatIssue(issue))
+print("%i anchor issues found." % len(issues))
@@ -0,0 +1,11 @@
+"""
+Print the marks that collide with, or come too close to, their base
+glyphs in all open fonts, worst first.
+"""
+
+from MarkCollisions import checkFonts, formatCollision
+
+
+for collisions in checkFonts(AllFonts()):
+    for collision in collisions:
+        print(formatCollision(collision))
@@ -0,0 +1,30 @@
+from PyObjCTools.AppHelper import callLater
+
+
+class CoalescedCall(object):
+    # Run a function at most once per pass of the run loop, no matter how
+    # often it was requested in between. Used to merge several redraw
+    # requests that happen within one frame into a single redraw.
+
+    def __init__(self, func, delay=0):
+        self.func = func
+        self.delay = delay
+        self.pending = False
+
+    def schedule(self):
+        if not self.pending:
+            self.pending = True
+            callLater(self.delay, self._fire)
+
+    def cancel(self):
+        self.pending = False
+
+    def flush(self):
+        # Run a pending call right now instead of waiting for the run loop
+        if self.pending:
+            self._fire()
+
+    def _fire(self):
+        if self.pending:
+            self.pending = False
+            self.func()
@@ -0,0 +1,42 @@
+"""
+Decide which glyphs are drawn around a glyph to preview its anchors.
+
+The plan is shared by the overlay in the glyph window and the headless
+proof renderer, so both show the same combinations.
+"""
+
+
+def getDrawPlan(fontAnchors, glyph, getAnchorPosition=None, baseOnly=False):
+    # Return a list of (glyph name, x offset, y offset) for all visible
+    # glyphs attached to the anchors of the glyph. getAnchorPosition(glyph
+    # name, anchor name, position=None) may return other positions than
+    # those in the anchor index, e.g. interpolated ones. If baseOnly is
+    # True, only marks attached to base anchors are included, not the base
+    # glyphs a mark glyph can attach to.
+    if getAnchorPosition is None:
+
+        def getAnchorPosition(glyphName, anchorName, position=None):
+            if position is None:
+                position = fontAnchors.anchorPositions[glyphName, anchorName]
+            return position
+
+    plan = []
+    for a in glyph.anchors:
+        anchor_name = a.name
+        if not fontAnchors.getVisibility("anchor", anchor_name):
+            continue
+        if anchor_name[0] == "_":
+            if baseOnly:
+                continue
+            kind = "glyph"
+        else:
+            kind = "mark"
+        matching_name = fontAnchors.getMatchingAnchorName(anchor_name)
+        # get translation for base anchor
+        dbx, dby = getAnchorPosition(glyph.name, anchor_name, (a.x, a.y))
+        for gn in fontAnchors.getAnchoredGlyphNames(anchor_name):
+            if fontAnchors.getVisibility(kind, gn, False):
+                # get translation for current mark anchor
+                dmx, dmy = getAnchorPosition(gn, matching_name)
+                plan.append((gn, dbx - dmx, dby - dmy))
+    return plan
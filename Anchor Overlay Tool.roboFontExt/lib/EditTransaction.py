@@ -0,0 +1,111 @@
+class EditTransaction(object):
+    # Context manager for bulk edits in a font.
+    #
+    #     with EditTransaction(font, "Align anchors") as transaction:
+    #         glyph = transaction.getGlyph("a")
+    #         glyph.anchors[0].y = 500
+    #
+    # Notifications are held until the end of the transaction and then
+    # posted once each, so observers and redraws run once per change set
+    # instead of once per edit. Each glyph fetched through getGlyph or
+    # addGlyph is registered for undo before it is changed, and gets one
+    # change notification at the end.
+    #
+    # With groupUndo=True, the glyphs are not registered for undo one by
+    # one. Instead, their state before the transaction is kept, and the
+    # whole transaction becomes one step in the undo manager of the font
+    # document, e.g. for imports that change thousands of glyphs.
+
+    def __init__(self, font, title, redraw=None, groupUndo=False):
+        self.font = font
+        self.title = title
+        self.redraw = redraw
+        self.groupUndo = groupUndo
+        self.glyphs = {}
+        self._dispatcher = None
+        # (glyph, serialized glyph data) before the transaction, for
+        # grouped undo
+        self._undoManager = None
+        self._undoStates = []
+
+    def __enter__(self):
+        # Hold all notifications, not only those posted by the font object
+        self._dispatcher = getattr(self.font.naked(), "dispatcher", None)
+        if self._dispatcher is not None:
+            self._dispatcher.holdNotifications()
+        if self.groupUndo:
+            self._undoManager = self._getUndoManager()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            for glyph in self.glyphs.values():
+                if not self.groupUndo and hasattr(glyph, "performUndo"):
+                    glyph.performUndo()
+                glyph.changed()
+        finally:
+            if self._dispatcher is not None:
+                self._dispatcher.releaseHeldNotifications()
+                self._dispatcher = None
+        if self._undoManager is not None and self._undoStates:
+            self._registerUndo(self._undoManager, self._undoStates)
+        self._undoManager = None
+        self._undoStates = []
+        if self.redraw is not None:
+            self.redraw()
+        return False
+
+    # Grouped undo
+
+    def _getUndoManager(self):
+        # The undo manager of the font document, or None outside of
+        # RoboFont or for fonts without a document
+        document = getattr(self.font, "document", None)
+        if document is None:
+            return None
+        document = document()
+        if document is None:
+            return None
+        return document.undoManager()
+
+    def _registerUndo(self, undoManager, states):
+        # Register one undo step that puts the glyphs back into the given
+        # states. Undoing registers the way back as the redo step.
+        undoManager.registerUndoWithTarget_handler_(
+            self.font.document(),
+            lambda target: self._restore(undoManager, states),
+        )
+        undoManager.setActionName_(self.title)
+
+    def _restore(self, undoManager, states):
+        current = [
+            (glyph, glyph.naked().getDataForSerialization())
+            for glyph, _ in states
+        ]
+        with EditTransaction(self.font, self.title):
+            for glyph, data in states:
+                glyph.naked().setDataFromSerialization(data)
+        self._registerUndo(undoManager, current)
+
+    def addGlyph(self, glyph, title=None):
+        # Register a glyph object for editing, e.g. the current glyph, which
+        # may be in another layer than the default layer. Glyphs are keyed
+        # by their defcon object, so each one is registered once.
+        key = id(glyph.naked())
+        if key not in self.glyphs:
+            if self.groupUndo:
+                if self._undoManager is not None:
+                    self._undoStates.append(
+                        (glyph, glyph.naked().getDataForSerialization())
+                    )
+            elif hasattr(glyph, "prepareUndo"):
+                glyph.prepareUndo(undoTitle=title or self.title)
+            self.glyphs[key] = glyph
+        return glyph
+
+    def getGlyph(self, name, title=None):
+        # Return the glyph of the default layer for editing
+        return self.addGlyph(self.font[name], title)
+
+    def getChangedGlyphNames(self):
+        return sorted({glyph.name for glyph in self.glyphs.values()})
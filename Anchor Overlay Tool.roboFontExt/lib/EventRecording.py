@@ -0,0 +1,114 @@
+"""
+Record the events of an Anchor Tool session for replay with
+AnchorToolReplay.
+
+The mouse and key events of the tool and the draw callbacks of the
+overlay are written as JSON Lines, one event per line, with the time the
+event took in RoboFont:
+
+    {"type": "keyDown", "glyph": "A", "characters": "", "shift": false,
+     "option": false, "arrows": {"up": true, ...}, "time": 12.5,
+     "duration": 0.8}
+
+Times are in milliseconds since the start of the recording.
+"""
+
+from json import dumps
+from os.path import expanduser, join
+from time import perf_counter
+
+
+toolEvents = ("mouseDown", "mouseDragged", "mouseUp", "keyDown")
+
+defaultPath = join(expanduser("~"), "Documents", "AnchorTool_Session.jsonl")
+
+
+class EventRecorder(object):
+    def __init__(self, tool):
+        self.tool = tool
+        self.events = []
+        self._start = None
+        self._overlay = None
+
+    def _getEventData(self, name, args):
+        data = {"type": name}
+        if name == "draw":
+            glyph = args[0]["glyph"]
+            data["glyph"] = glyph.name if glyph is not None else None
+            return data
+        glyph = self.tool.getGlyph()
+        data["glyph"] = glyph.name if glyph is not None else None
+        data["shift"] = bool(self.tool.shiftDown)
+        data["option"] = bool(self.tool.optionDown)
+        if name == "keyDown":
+            data["characters"] = args[0].characters()
+            data["arrows"] = dict(self.tool.arrowKeysDown)
+        else:
+            data["point"] = [args[0].x, args[0].y]
+            if name == "mouseDown":
+                data["clickCount"] = args[1]
+            elif name == "mouseDragged":
+                data["delta"] = [args[1].x, args[1].y]
+        return data
+
+    def _wrap(self, name, method):
+        def recordedMethod(*args):
+            data = self._getEventData(name, args)
+            start = perf_counter()
+            result = method(*args)
+            end = perf_counter()
+            data["time"] = (start - self._start) * 1000
+            data["duration"] = (end - start) * 1000
+            self.events.append(data)
+            return result
+
+        return recordedMethod
+
+    def start(self):
+        # Wrap the event methods of the tool instance and the draw callback
+        # of its overlay. Observers look up their callbacks by name, so the
+        # instance attributes take effect immediately.
+        self._start = perf_counter()
+        for name in toolEvents:
+            setattr(
+                self.tool, name, self._wrap(name, getattr(self.tool, name))
+            )
+        self._overlay = self.tool.anchorOverlayUI
+        if self._overlay is not None:
+            self._overlay.glyphChanged = self._wrap(
+                "draw", self._overlay.glyphChanged
+            )
+
+    def stop(self):
+        for name in toolEvents:
+            self.tool.__dict__.pop(name, None)
+        if self._overlay is not None:
+            self._overlay.__dict__.pop("glyphChanged", None)
+            self._overlay = None
+
+    def save(self, path=defaultPath):
+        with open(path, "w", encoding="utf-8") as f:
+            for event in self.events:
+                f.write(dumps(event) + "\n")
+
+
+# The recorder of the running session, if any
+currentRecorder = None
+
+
+def toggleRecording(tool, path=defaultPath):
+    # Start recording the tool, or stop the running recording and save it
+    global currentRecorder
+    if currentRecorder is not None:
+        currentRecorder.stop()
+        currentRecorder.save(path)
+        print(
+            "%i events written to '%s'." % (len(currentRecorder.events), path)
+        )
+        currentRecorder = None
+    elif tool is None or not hasattr(tool, "anchorOverlayUI"):
+        print("Activate the Anchor Tool before recording.")
+    else:
+        currentRecorder = EventRecorder(tool)
+        currentRecorder.start()
+        print("Recording Anchor Tool events. Run the script again to stop.")
@@ -0,0 +1,29 @@
+"""
+Write the mark and mkmk features of the current font to a file next to
+the UFO. Exporting again only regenerates the anchor classes that changed.
+"""
+
+import codecs
+from os.path import expanduser, join, splitext
+
+from MarkFeatureWriter import MarkFeatureWriter
+
+
+font = CurrentFont()
+if font is not None:
+    if font.path:
+        path = "%s_mark.fea" % splitext(font.path)[0]
+    else:
+        path = join(
+            expanduser("~"),
+            "Documents",
+            "%s-%s_mark.fea" % (font.info.familyName, font.info.styleName),
+        )
+    writer = MarkFeatureWriter.forFont(font)
+    fea = writer.getFeatureText()
+    with codecs.open(path, "wb", encoding="utf-8") as f:
+        f.write(fea)
+    print(
+        "Mark feature written to '%s' (%i anchor classes updated)."
+        % (path, writer.numChangedClasses)
+    )
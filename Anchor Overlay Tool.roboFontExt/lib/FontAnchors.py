@@ -1,5 +1,12 @@
-from mojo.extensions import getExtensionDefault
-from extensionID import extensionID
+from extensionSettings import extensionSettings
+from AnchorNameModel import AnchorNameModel
+from AnchorQuery import AnchorQuery
+from GlyphVersion import getGlyphVersion
+
+
+def getFontName(font):
+    # The name of a font in reports and tables, "Family Style"
+    return "%s %s" % (font.info.familyName, font.info.styleName)
 
 
 class FontAnchors(object):
@@ -7,63 +14,118 @@ class FontAnchors(object):
     anchorNames = []
     anchorGlyphs = {}
     anchorPositions = {}
-    invisibleAnchors = []
-    invisibleGlyphs = []
-    invisibleMarks = []
 
-    hideLists = {
-        "anchor": invisibleAnchors,
-        "glyph": invisibleGlyphs,
-        "mark": invisibleMarks,
-    }
+    hideKinds = ("anchor", "glyph", "mark")
+
+    version = 0
+    hideVersion = 0
 
     def __init__(self, font):
         self.font = font
         self._readFromFont(self.font)
-        self.hideLists = getExtensionDefault(
-            "%s.%s" % (extensionID, "hide"), self.hideLists
-        )
+        # The hidden names are stored as lists in the defaults, but kept as
+        # sets while the tool is running for fast lookups and updates
+        hideLists = extensionSettings.get("hide")
+        self.hideSets = {
+            kind: set(hideLists.get(kind, [])) for kind in self.hideKinds
+        }
+
+    @property
+    def hideLists(self):
+        return {kind: sorted(self.hideSets[kind]) for kind in self.hideKinds}
 
     def _readFromFont(self, font):
         self.anchorNames = []
         self.anchorGlyphs = {}
         self.anchorPositions = {}
+        self.duplicateAnchors = []
+        # anchor names per glyph, and the glyph versions at the time the
+        # glyphs were read, for incremental updates
+        self.glyphAnchorNames = {}
+        self._glyphVersions = {}
+        self.version += 1
+        self._nameModel = None
 
         if font is not None:
             for g in font:
-                if len(g.anchors) > 0:
-                    for a in g.anchors:
-                        self.addAnchor(g, a.name, (a.x, a.y))
-            # for a in sorted(self.anchorBaseMap.keys()):
-            #    self.anchorNames.append({"Show": True, "Name": a})
-            # print("\nanchorGlyphs:", self.anchorGlyphs)
-            # print("\nanchorPositions:", self.anchorPositions)
-            # print()
+                self._readGlyph(g)
+
+    def _readGlyph(self, g):
+        self._glyphVersions[g.name] = getGlyphVersion(g)
+        for a in g.anchors:
+            self.addAnchor(g, a.name, (a.x, a.y))
+
+    def removeGlyph(self, glyphName):
+        # Remove all anchors of a glyph from the index
+        for name in self.glyphAnchorNames.pop(glyphName, []):
+            del self.anchorPositions[glyphName, name]
+            glyphNames = self.anchorGlyphs[name]
+            glyphNames.remove(glyphName)
+            if not glyphNames:
+                del self.anchorGlyphs[name]
+        self.duplicateAnchors = [
+            d for d in self.duplicateAnchors if d[0] != glyphName
+        ]
+        self._glyphVersions.pop(glyphName, None)
+        self.version += 1
+        # The name statistics can't be updated for removed anchors, so
+        # they are rebuilt on next use
+        self._nameModel = None
+
+    def updateGlyphs(self, glyphNames):
+        # Re-read the anchors of some glyphs, e.g. after they were changed
+        for glyphName in glyphNames:
+            self.removeGlyph(glyphName)
+            if glyphName in self.font:
+                self._readGlyph(self.font[glyphName])
+
+    def syncGlyph(self, glyphName):
+        # Re-read the anchors of one glyph if it was changed since it was
+        # last read, e.g. while an anchor is dragged. Returns True if the
+        # glyph was re-read.
+        if glyphName not in self.font:
+            return False
+        version = getGlyphVersion(self.font[glyphName])
+        if version is self._glyphVersions.get(glyphName):
+            return False
+        self.updateGlyphs([glyphName])
+        return True
+
+    def sync(self):
+        # Re-read only the glyphs that were changed, added or removed since
+        # they were last read. Returns the names of those glyphs.
+        changed = [
+            g.name
+            for g in self.font
+            if getGlyphVersion(g) is not self._glyphVersions.get(g.name)
+        ]
+        removed = set(self._glyphVersions) - set(self.font.keys())
+        changed.extend(sorted(removed))
+        self.updateGlyphs(changed)
+        return changed
 
     def getVisibility(self, kind, name, includeMatching=True):
-        hideList = self.hideLists[kind]
+        hideSet = self.hideSets[kind]
         if not (
-            name in hideList
+            name in hideSet
             or (
                 includeMatching
-                and self.getMatchingAnchorName(name) in hideList
+                and self.getMatchingAnchorName(name) in hideSet
             )
         ):
             return True
         return False
 
     def setVisibility(self, kind, name, isVisible=True, includeMatching=True):
-        hideList = self.hideLists[kind]
+        hideSet = self.hideSets[kind]
+        self.hideVersion += 1
+        names = [name]
+        if includeMatching:
+            names.append(self.getMatchingAnchorName(name))
         if isVisible:
-            if name in hideList:
-                hideList.remove(name)
-                if includeMatching:
-                    hideList.remove(self.getMatchingAnchorName(name))
+            hideSet.difference_update(names)
         else:
-            if not (name in hideList):
-                hideList.append(name)
-                if includeMatching:
-                    hideList.append(self.getMatchingAnchorName(name))
+            hideSet.update(names)
 
     def addAnchor(self, glyph, name, position, addToGlyph=False):
         if len(name) == 0:
@@ -72,17 +134,22 @@ class FontAnchors(object):
                 % (position[0], position[1], glyph.name)
             )
         else:
-            if (glyph.name, name) in self.anchorPositions.keys():
+            if (glyph.name, name) in self.anchorPositions:
                 print(
                     "WARNING: Duplicate anchor name '%s' requested in glyph '%s' when trying to add anchor. Ignored."
                     % (name, glyph.name)
                 )
+                self.duplicateAnchors.append((glyph.name, name))
             else:
                 self.anchorPositions[(glyph.name, name)] = position
+                self.glyphAnchorNames.setdefault(glyph.name, []).append(name)
+                self.version += 1
                 if name in self.anchorGlyphs.keys():
                     self.anchorGlyphs[name] += [glyph.name]
                 else:
                     self.anchorGlyphs[name] = [glyph.name]
+                if self._nameModel is not None:
+                    self._nameModel.addSample(glyph, name, position)
                 if addToGlyph:
                     glyph.appendAnchor(name, position)
 
@@ -149,8 +216,23 @@ class FontAnchors(object):
                 )
         return result
 
+    def getQuery(self):
+        # Return an AnchorQuery object for indexed lookups in this font
+        if getattr(self, "_query", None) is None:
+            self._query = AnchorQuery(self)
+        return self._query
+
+    def getNameModel(self):
+        # Return the AnchorNameModel for this font, which is built on first
+        # use and then kept up to date by addAnchor
+        if self._nameModel is None:
+            self._nameModel = AnchorNameModel(self)
+        return self._nameModel
+
+    def hasAnchor(self, glyphName, anchorName):
+        return (glyphName, anchorName) in self.anchorPositions
+
     def selectGlyphsWithAnchorName(self, anchorName):
-        self.font.selection = self.getAnchoredGlyphNames(
-            self.getMatchingAnchorName(anchorName)
-        )
+        # The anchor name may also be a pattern like "top*"
+        self.font.selection = self.getQuery().getGlyphsWithAnchor(anchorName)
         # self.font.update()
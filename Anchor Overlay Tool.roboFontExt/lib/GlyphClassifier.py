@@ -0,0 +1,240 @@
+"""
+Decide how the components of a composite glyph are positioned.
+
+Ligature-style glyphs have their components put next to each other, and
+their width is the sum of the component widths. Mark-style glyphs have
+their components attached by anchors and get the width of the base glyph.
+
+The decision is made by rules, in this order:
+
+1. Explicit glyph names (without suffix), see ignoreAnchorNames and
+   ligatureNames below
+2. The glyph category in the font lib (public.openTypeCategories), as
+   used for the GDEF table
+3. The Unicode decomposition of the glyph's code point: fraction
+   decompositions are ligatures, canonical decompositions are marks. Other
+   compatibility decompositions, e.g. of ldot or DZ, are left to the other
+   rules, as their components don't simply sit next to each other.
+4. Glyph names containing an underscore are ligatures, unless they end
+   with "comb"
+
+Results are cached per font and glyph name, and reused in later runs as
+long as the categories object in the font lib is the same.
+"""
+
+from unicodedata import decomposition
+from weakref import WeakKeyDictionary
+
+
+LIGATURE = "ligature"
+MARK = "mark"
+
+categoriesLibKey = "public.openTypeCategories"
+
+# Unicode decomposition tags that mean the character is a ligature
+ligatureDecompositionTags = {"<fraction>"}
+
+
+def getBaseName(glyphname):
+    if "." in glyphname and not (glyphname in [".notdef", ".null"]):
+        glyphname = glyphname.split(".", 1)[0]
+    return glyphname
+
+
+class GlyphClassification(object):
+    def __init__(self, kind, sumWidths):
+        # kind is LIGATURE or MARK
+        self.kind = kind
+        # True if the glyph width is the sum of the component widths
+        self.sumWidths = sumWidths
+
+    @property
+    def isLigature(self):
+        return self.kind == LIGATURE
+
+
+class GlyphClassifier(object):
+    _cache = WeakKeyDictionary()
+
+    def __init__(
+        self,
+        font,
+        ignoreAnchorNames=None,
+        ligatureNames=None,
+        useCategories=True,
+        useUnicode=True,
+    ):
+        self.font = font
+        if ignoreAnchorNames is None:
+            ignoreAnchorNames = defaultIgnoreAnchorNames
+        if ligatureNames is None:
+            ligatureNames = defaultLigatureNames
+        self.ignoreAnchorNames = set(ignoreAnchorNames)
+        self.ligatureNames = set(ligatureNames)
+        self.useCategories = useCategories
+        self.useUnicode = useUnicode
+        self._categoriesObject = self._getCategoriesObject()
+        if self.useCategories and self._categoriesObject is not None:
+            self._categories = dict(self._categoriesObject)
+        else:
+            self._categories = {}
+        self._classifications = {}
+
+    @classmethod
+    def forFont(cls, font):
+        # Return the cached classifier with the default rules for the font
+        key = font.naked()
+        classifier = cls._cache.get(key)
+        if classifier is None or not classifier.isValid():
+            classifier = cls(font)
+            cls._cache[key] = classifier
+        return classifier
+
+    def _getCategoriesObject(self):
+        return self.font.naked().lib.get(categoriesLibKey)
+
+    def isValid(self):
+        # The cache is only valid as long as the GDEF categories haven't
+        # been replaced. RoboFont sets a new dict when they are edited, so
+        # comparing the identity is enough and doesn't copy the dict on
+        # every lookup.
+        return self._getCategoriesObject() is self._categoriesObject
+
+    def _getKind(self, glyphname):
+        nameWithoutSuffix = getBaseName(glyphname)
+        if nameWithoutSuffix in self.ignoreAnchorNames:
+            return LIGATURE
+        category = self._categories.get(glyphname)
+        if category == LIGATURE:
+            return LIGATURE
+        elif category in ("base", "mark"):
+            return MARK
+        if self.useUnicode and glyphname in self.font:
+            unicode = self.font[glyphname].unicode
+            if unicode is not None:
+                decomposed = decomposition(chr(unicode))
+                if decomposed:
+                    if decomposed.split()[0] in ligatureDecompositionTags:
+                        return LIGATURE
+                    if not decomposed.startswith("<"):
+                        return MARK
+        if "_" in nameWithoutSuffix and not nameWithoutSuffix.endswith("comb"):
+            return LIGATURE
+        return MARK
+
+    def classify(self, glyphname):
+        # Return the GlyphClassification for a glyph
+        if glyphname not in self._classifications:
+            kind = self._getKind(glyphname)
+            self._classifications[glyphname] = GlyphClassification(
+                kind,
+                kind == LIGATURE
+                or getBaseName(glyphname) in self.ligatureNames,
+            )
+        return self._classifications[glyphname]
+
+    def clear(self, glyphname=None):
+        # Forget the classification of one or all glyphs
+        if glyphname is None:
+            self._classifications = {}
+        else:
+            self._classifications.pop(glyphname, None)
+
+
+# Glyphs whose width is the sum of their component widths
+defaultLigatureNames = {
+    "uniFB00",
+    "fi",
+    "fl",
+    "uniFB01",
+    "uniFB02",
+    "uniFB03",
+    "uniFB04",
+    "uniFB05",
+    "uniFB06",
+    "dcaron",
+    "lcaron",
+    "IJ",
+    "ij",
+    "napostrophe",
+    "onequarter",
+    "onehalf",
+    "threequarters",
+    "onethird",
+    "twothirds",
+    "uni2155",
+    "uni2156",
+    "uni2157",
+    "uni2158",
+    "uni2159",
+    "uni215A",
+    "oneeighth",
+    "threeeighths",
+    "fiveeighths",
+    "seveneighths",
+    "uni215F",
+    "uni2150",
+    "uni2151",
+    "uni2152",
+    "uni2189",
+    "percent",
+    "perthousand",
+    "germandbls",
+    "uni01C4",
+    "uni01C5",
+    "uni01C6",
+    "uni01C7",
+    "uni01C8",
+    "uni01C9",
+    "uni01CA",
+    "uni01CB",
+    "uni01CC",
+}
+
+# Glyphs whose components are put next to each other instead of being
+# attached by anchors
+defaultIgnoreAnchorNames = {
+    "uniFB00",
+    "fi",
+    "fl",
+    "uniFB01",
+    "uniFB02",
+    "uniFB03",
+    "uniFB04",
+    "uniFB05",
+    "uniFB06",
+    "IJ",
+    "ij",
+    "napostrophe",
+    "onequarter",
+    "onehalf",
+    "threequarters",
+    "onethird",
+    "twothirds",
+    "uni2155",
+    "uni2156",
+    "uni2157",
+    "uni2158",
+    "uni2159",
+    "uni215A",
+    "oneeighth",
+    "threeeighths",
+    "fiveeighths",
+    "seveneighths",
+    "uni215F",
+    "uni2150",
+    "uni2151",
+    "uni2152",
+    "uni2189",
+    "percent",
+    "perthousand",
+    "uni01C4",
+    "uni01C5",
+    "uni01C6",
+    "uni01C7",
+    "uni01C8",
+    "uni01C9",
+    "uni01CA",
+    "uni01CB",
+    "uni01CC",
+}
@@ -0,0 +1,311 @@
+"""
+Detect glyph files of a UFO that were changed by other applications, e.g.
+by build scripts or a version control checkout, while the font is open.
+
+The glyphs folder is watched with FSEvents on macOS and with inotify on
+Linux, so an idle font costs nothing but collecting the events. If neither
+is available, the modification times and sizes of the .glif files are
+compared each time the watcher is asked for changes.
+
+Files written by the font's own saves are not outside changes. Call
+ignoreOwnChanges() after each save: files whose modification time and
+size are still the same as right after the save are not reported.
+
+    watcher = GlyphFileWatcher(font.path)
+    # ... after font.save() ...
+    watcher.ignoreOwnChanges()
+    # ... later, e.g. from a timer ...
+    updateFromDisk(fontAnchors, watcher.getChangedGlyphNames())
+"""
+
+import ctypes
+import ctypes.util
+import os
+import plistlib
+import struct
+import sys
+
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_CLOEXEC = 0o2000000
+
+watchMask = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+# struct inotify_event without the name: wd, mask, cookie, len
+eventHeader = struct.Struct("iIII")
+
+# Seconds FSEvents collects events before delivering them
+fsEventsLatency = 0.5
+
+
+def scanFileStats(directory):
+    # Return a dict of file name -> (modification time, size) for the
+    # .glif files and contents.plist of a folder
+    stats = {}
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return stats
+    with entries:
+        for entry in entries:
+            if entry.name.endswith((".glif", "contents.plist")):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                stats[entry.name] = (st.st_mtime_ns, st.st_size)
+    return stats
+
+
+def getFileStat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _getLibc():
+    if not sys.platform.startswith("linux"):
+        return None
+    path = ctypes.util.find_library("c")
+    if path is None:
+        return None
+    libc = ctypes.CDLL(path, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+class InotifyBackend(object):
+    # Collects the names of changed files in a folder from inotify events
+
+    def __init__(self, directory):
+        libc = _getLibc()
+        if libc is None:
+            raise OSError("inotify is not available")
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), watchMask)
+        if wd < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def getChangedFileNames(self):
+        # Return the set of changed file names, or None if events were lost
+        # and all files must be considered changed
+        fileNames = set()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = eventHeader.unpack_from(data, offset)
+                offset += eventHeader.size
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if name:
+                    fileNames.add(os.fsdecode(name))
+        return fileNames
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class FSEventsBackend(object):
+    # Collects the names of changed files in a folder from FSEvents, which
+    # are delivered on the main run loop
+
+    def __init__(self, directory):
+        try:
+            from CoreFoundation import CFRunLoopGetMain, kCFRunLoopDefaultMode
+            import FSEvents
+        except ImportError:
+            raise OSError("FSEvents is not available")
+        self._FSEvents = FSEvents
+        self.directory = os.path.realpath(directory)
+        self._fileNames = set()
+        self._lost = False
+        self.stream = FSEvents.FSEventStreamCreate(
+            None,
+            self._callback,
+            None,
+            [self.directory],
+            FSEvents.kFSEventStreamEventIdSinceNow,
+            fsEventsLatency,
+            FSEvents.kFSEventStreamCreateFlagFileEvents
+            | FSEvents.kFSEventStreamCreateFlagUseCFTypes,
+        )
+        if self.stream is None:
+            raise OSError("FSEventStreamCreate failed")
+        FSEvents.FSEventStreamScheduleWithRunLoop(
+            self.stream, CFRunLoopGetMain(), kCFRunLoopDefaultMode
+        )
+        if not FSEvents.FSEventStreamStart(self.stream):
+            self.close()
+            raise OSError("FSEventStreamStart failed")
+
+    def _callback(self, stream, info, numEvents, paths, flags, eventIds):
+        lostFlags = (
+            self._FSEvents.kFSEventStreamEventFlagMustScanSubDirs
+            | self._FSEvents.kFSEventStreamEventFlagUserDropped
+            | self._FSEvents.kFSEventStreamEventFlagKernelDropped
+        )
+        for path, flag in zip(paths, flags):
+            if flag & lostFlags:
+                self._lost = True
+            elif os.path.dirname(path) == self.directory:
+                self._fileNames.add(os.path.basename(path))
+
+    def getChangedFileNames(self):
+        # Return the set of changed file names, or None if events were lost
+        # and all files must be considered changed
+        if self._lost:
+            self._lost = False
+            self._fileNames = set()
+            return None
+        fileNames = self._fileNames
+        self._fileNames = set()
+        return fileNames
+
+    def close(self):
+        if self.stream is not None:
+            self._FSEvents.FSEventStreamStop(self.stream)
+            self._FSEvents.FSEventStreamInvalidate(self.stream)
+            self._FSEvents.FSEventStreamRelease(self.stream)
+            self.stream = None
+
+
+class PollingBackend(object):
+    # Compares the modification time and size of the .glif files in a
+    # folder to those of the previous call
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._stats = scanFileStats(directory)
+
+    def getChangedFileNames(self):
+        stats = scanFileStats(self.directory)
+        fileNames = {
+            name
+            for name in set(stats) | set(self._stats)
+            if stats.get(name) != self._stats.get(name)
+        }
+        self._stats = stats
+        return fileNames
+
+    def close(self):
+        self._stats = {}
+
+
+class GlyphFileWatcher(object):
+    # Watches the default layer of a UFO and maps changed files to glyph
+    # names
+
+    def __init__(self, ufoPath, layerDirectory="glyphs", usePolling=False):
+        self.directory = os.path.join(ufoPath, layerDirectory)
+        self.backend = None
+        if not usePolling:
+            if sys.platform == "darwin":
+                backendClass = FSEventsBackend
+            else:
+                backendClass = InotifyBackend
+            try:
+                self.backend = backendClass(self.directory)
+            except OSError:
+                pass
+        if self.backend is None:
+            self.backend = PollingBackend(self.directory)
+        self._glyphNames = self._readContents()
+        # File stats right after the last save of the font itself
+        self._savedStats = {}
+
+    def _readContents(self):
+        # Return a dict of file name -> glyph name
+        path = os.path.join(self.directory, "contents.plist")
+        try:
+            with open(path, "rb") as f:
+                contents = plistlib.load(f)
+        except Exception:
+            # Missing or being written right now, keep the previous mapping
+            return getattr(self, "_glyphNames", {})
+        return {fileName: name for name, fileName in contents.items()}
+
+    def ignoreOwnChanges(self):
+        # Call after the font was saved. The files as they are now were
+        # written by the font itself, so they are not reported as changed.
+        self._savedStats = scanFileStats(self.directory)
+
+    def _isOwnChange(self, fileName):
+        saved = self._savedStats.get(fileName)
+        if saved is None:
+            return False
+        return getFileStat(os.path.join(self.directory, fileName)) == saved
+
+    def getChangedGlyphNames(self):
+        # Return the sorted names of the glyphs whose files were changed,
+        # added or removed since the last call, except by the font's own
+        # saves
+        fileNames = self.backend.getChangedFileNames()
+        if fileNames is None:
+            # Events were lost, everything may have changed
+            self._glyphNames = self._readContents()
+            return sorted(
+                name
+                for fileName, name in self._glyphNames.items()
+                if not self._isOwnChange(fileName)
+            )
+        fileNames = {f for f in fileNames if not self._isOwnChange(f)}
+        if not fileNames:
+            return []
+        previousNames = self._glyphNames
+        if "contents.plist" in fileNames or any(
+            f.endswith(".glif") and f not in previousNames for f in fileNames
+        ):
+            self._glyphNames = self._readContents()
+        glyphNames = set()
+        for fileName in fileNames:
+            if not fileName.endswith(".glif"):
+                continue
+            name = self._glyphNames.get(fileName, previousNames.get(fileName))
+            if name is not None:
+                glyphNames.add(name)
+        return sorted(glyphNames)
+
+    def close(self):
+        self.backend.close()
+
+
+def updateFromDisk(fontAnchors, glyphNames):
+    # Reload glyphs that were changed on disk into the font, and update the
+    # anchor index for them. Glyphs with unsaved changes are not reloaded.
+    # Glyphs that were added on disk are not added to the font.
+    if not glyphNames:
+        return []
+    font = fontAnchors.font.naked()
+    reloadNames = []
+    for name in glyphNames:
+        if name not in font:
+            continue
+        if font[name].dirty:
+            print(
+                "WARNING: Glyph '%s' was changed on disk, but has unsaved "
+                "changes. Not reloaded." % name
+            )
+        else:
+            reloadNames.append(name)
+    if reloadNames:
+        font.reloadGlyphs(reloadNames)
+    fontAnchors.updateGlyphs(glyphNames)
+    return reloadNames
@@ -0,0 +1,81 @@
+"""
+Cached geometry of the glyphs of a font.
+
+GlyphGeometry.forFont returns one cache per font, shared by the tool, the
+overlay and the recomposer. The advance width and bounding box of a glyph
+are read once and reused until the glyph changes, which is detected by its
+GlyphVersion token.
+
+Use clear() to forget a glyph explicitly, e.g. after changing it inside
+an EditTransaction, where change notifications are held.
+"""
+
+from weakref import WeakKeyDictionary
+
+from GlyphVersion import getGlyphVersion
+
+
+def getPointBounds(points):
+    # Return the bounding box (xMin, yMin, xMax, yMax) of a list of (x, y)
+    # coordinates, or None if the list is empty
+    if not points:
+        return None
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class GlyphMetrics(object):
+    def __init__(self, glyph):
+        self.width = glyph.width
+        # Bounding box including components, or None for empty glyphs
+        self.bounds = glyph.bounds
+
+
+class GlyphGeometry(object):
+    _cache = WeakKeyDictionary()
+
+    def __init__(self, font):
+        self.font = font
+        # glyph name -> (glyph version, GlyphMetrics)
+        self._entries = {}
+
+    @classmethod
+    def forFont(cls, font):
+        # Return the shared cache for the font
+        key = font.naked()
+        geometry = cls._cache.get(key)
+        if geometry is None:
+            geometry = cls(font)
+            cls._cache[key] = geometry
+        return geometry
+
+    def getGlyphMetrics(self, glyph):
+        # Return the GlyphMetrics of a glyph object of the font
+        version = getGlyphVersion(glyph)
+        entry = self._entries.get(glyph.name)
+        if entry is None or entry[0] is not version:
+            entry = (version, GlyphMetrics(glyph))
+            self._entries[glyph.name] = entry
+        return entry[1]
+
+    def getMetrics(self, glyphName):
+        return self.getGlyphMetrics(self.font[glyphName])
+
+    def getWidth(self, glyphName):
+        return self.getMetrics(glyphName).width
+
+    def getBounds(self, glyphName):
+        return self.getMetrics(glyphName).bounds
+
+    def clear(self, glyphName=None):
+        # Forget the geometry of one or all glyphs
+        if glyphName is None:
+            self._entries = {}
+        else:
+            self._entries.pop(glyphName, None)
+
+
+def getGlyphMetrics(glyph):
+    # Return the cached GlyphMetrics of a glyph
+    return GlyphGeometry.forFont(glyph.font).getGlyphMetrics(glyph)
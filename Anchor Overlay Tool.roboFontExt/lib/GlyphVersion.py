@@ -0,0 +1,27 @@
+"""
+Cheap change tracking for glyphs.
+
+getGlyphVersion returns an object that stays the same as long as the glyph
+is not changed. It is stored as a defcon representation, so defcon throws
+it away on every glyph change notification, and the next call returns a new
+object. Compare versions with "is".
+"""
+
+from defcon import Glyph, registerRepresentationFactory
+
+from extensionID import extensionID
+
+
+representationName = "%s.version" % extensionID
+
+
+def glyphVersionFactory(glyph):
+    return object()
+
+
+registerRepresentationFactory(Glyph, representationName, glyphVersionFactory)
+
+
+def getGlyphVersion(glyph):
+    # Return the version token of a fontParts glyph
+    return glyph.naked().getRepresentation(representationName)
@@ -0,0 +1,18 @@
+"""
+Import anchor positions from a CSV table written by Export Anchor Table,
+or a JSON file in the same layout, into the open fonts.
+"""
+
+from mojo.UI import GetFile
+
+from AnchorImport import AnchorImport
+
+
+path = GetFile("Choose the anchor table to import", fileTypes=["csv", "json"])
+
+if path is not None:
+    anchorImport = AnchorImport(AllFonts())
+    anchorImport.importFile(path)
+    for message in anchorImport.messages:
+        print(message)
+    print(anchorImport.getSummary())
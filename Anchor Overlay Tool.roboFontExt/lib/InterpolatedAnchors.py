@@ -0,0 +1,84 @@
+"""
+Anchor positions at arbitrary designspace locations, interpolated from the
+masters collected by a MasterAnchors object.
+
+The deltas of each anchor are computed once and cached, and the support
+scalars are computed once per location, so evaluating many anchors at the
+same location is cheap.
+"""
+
+from fontTools.varLib.models import VariationModel, normalizeLocation
+
+
+class InterpolatedAnchors(object):
+    def __init__(self, masterAnchors):
+        self.masterAnchors = masterAnchors
+        self.axisLimits = {
+            axis.name: (
+                axis.map_forward(axis.minimum),
+                axis.map_forward(axis.default),
+                axis.map_forward(axis.maximum),
+            )
+            for axis in masterAnchors.axes
+        }
+        self.model = VariationModel(
+            [
+                normalizeLocation(location, self.axisLimits)
+                for location in masterAnchors.locations
+            ]
+        )
+        self._deltas = {}
+        self._location = None
+        self._scalars = None
+
+    def _getDeltas(self, glyphName, anchorName):
+        # Return the x and y deltas of an anchor, or None if the anchor is
+        # missing in any master
+        key = (glyphName, anchorName)
+        if key not in self._deltas:
+            positions = self.masterAnchors.glyphAnchors.get(glyphName, {}).get(
+                anchorName
+            )
+            if positions is None or None in positions:
+                deltas = None
+            else:
+                deltas = (
+                    self.model.getDeltas([p[0] for p in positions]),
+                    self.model.getDeltas([p[1] for p in positions]),
+                )
+            self._deltas[key] = deltas
+        return self._deltas[key]
+
+    def _getScalars(self, location):
+        if location != self._location:
+            self._scalars = self.model.getScalars(
+                normalizeLocation(location, self.axisLimits)
+            )
+            self._location = dict(location)
+        return self._scalars
+
+    def getAnchorPosition(self, glyphName, anchorName, location):
+        # Return the interpolated (x, y) of an anchor at a location in
+        # design coordinates, or None if the anchor is not compatible
+        deltas = self._getDeltas(glyphName, anchorName)
+        if deltas is None:
+            return None
+        scalars = self._getScalars(location)
+        interpolate = VariationModel.interpolateFromDeltasAndScalars
+        return (
+            interpolate(deltas[0], scalars),
+            interpolate(deltas[1], scalars),
+        )
+
+    def clearCache(self):
+        # Call after the anchors of the masters have changed
+        self._deltas = {}
+
+    def updateGlyphs(self, glyphNames):
+        # Re-read the master anchors of some glyphs, e.g. after one of them
+        # was edited, and forget their cached deltas
+        if not self.masterAnchors.updateGlyphs(glyphNames):
+            return
+        glyphNames = set(glyphNames)
+        for key in [key for key in self._deltas if key[0] in glyphNames]:
+            del self._deltas[key]
@@ -0,0 +1,71 @@
+import vanilla
+
+from defconAppKit.windows.baseWindow import BaseWindowController
+
+from InterpolatedAnchors import InterpolatedAnchors
+from MasterAnchors import MasterAnchors, openFont
+
+
+class InterpolationPreview(BaseWindowController):
+    # A window with one slider per designspace axis. The anchor overlay
+    # previews the mark positions at the location set by the sliders.
+
+    def __init__(self, anchorOverlay, designspacePath):
+        self.anchorOverlay = anchorOverlay
+        # Masters that were opened without UI for the preview, closed again
+        # with the window
+        self.hiddenFonts = []
+        masterAnchors = MasterAnchors.fromDesignspace(
+            designspacePath,
+            lambda path: openFont(path, self.hiddenFonts),
+        )
+        self.interpolatedAnchors = InterpolatedAnchors(masterAnchors)
+
+        axes = masterAnchors.axes
+        self.w = vanilla.FloatingWindow(
+            (220, 20 + 44 * len(axes)), "Anchor Interpolation Preview"
+        )
+        self.location = {}
+        self.sliders = {}
+        y = 10
+        for i, axis in enumerate(axes):
+            minimum, default, maximum = self.interpolatedAnchors.axisLimits[
+                axis.name
+            ]
+            self.location[axis.name] = default
+            setattr(
+                self.w,
+                "label_%i" % i,
+                vanilla.TextBox(
+                    (10, y, -10, 17), axis.name, sizeStyle="small"
+                ),
+            )
+            slider = vanilla.Slider(
+                (10, y + 17, -10, 23),
+                minValue=minimum,
+                maxValue=maximum,
+                value=default,
+                callback=self.updateLocation,
+                sizeStyle="small",
+            )
+            setattr(self.w, "slider_%i" % i, slider)
+            self.sliders[axis.name] = slider
+            y += 44
+
+        self.setUpBaseWindowBehavior()
+        self.updateLocation()
+        self.w.open()
+
+    def updateLocation(self, sender=None):
+        for name, slider in self.sliders.items():
+            self.location[name] = slider.get()
+        self.anchorOverlay.setInterpolation(
+            self.interpolatedAnchors, self.location
+        )
+
+    def windowCloseCallback(self, sender):
+        self.anchorOverlay.setInterpolation(None)
+        for font in self.hiddenFonts:
+            font.close()
+        self.hiddenFonts = []
+        super(InterpolationPreview, self).windowCloseCallback(sender)
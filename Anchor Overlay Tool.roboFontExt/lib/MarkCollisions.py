@@ -0,0 +1,405 @@
+"""
+Find marks that collide with, or come too close to, their base glyphs.
+
+Every base glyph is combined with every mark glyph that can attach to it
+through the anchor index, i.e. glyphs with a base anchor ("top") and
+glyphs with the matching mark anchor ("_top"). The mark outline is moved
+so the anchors meet, and compared to the base outline:
+
+1. The bounding boxes are compared first. Pairs whose boxes are further
+   apart than the clearance are skipped.
+2. For the remaining pairs, the flattened outlines are compared segment
+   by segment. Only segments near the other glyph's bounding box are
+   tested.
+
+The result is a list of collisions per font, worst first. The distance is
+the clearance between the outlines, 0 if they only touch, or the negative
+penetration depth if the outlines overlap.
+
+In RoboFont, the open fonts are checked one after the other. From the
+command line, UFOs are checked in parallel, one process per font, and the
+exit code is 1 if any outlines overlap:
+
+    python MarkCollisions.py --clearance 30 --limit 50 Regular.ufo Bold.ufo
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from math import hypot
+import sys
+
+from fontTools.pens.basePen import BasePen
+
+from FontAnchors import FontAnchors, getFontName
+
+
+defaultClearance = 20
+defaultLimit = 100
+
+# Number of line segments per curve when flattening outlines
+curveSteps = 8
+
+# Penetration depth reported for outlines that overlap, but whose measured
+# depth is smaller, so they still count as overlapping
+minimumOverlap = 1
+
+
+class FlatteningPen(BasePen):
+    # Collect the outlines of a glyph, including its components, as line
+    # segments (x0, y0, x1, y1)
+
+    def __init__(self, glyphSet):
+        BasePen.__init__(self, glyphSet)
+        self.segments = []
+        self._start = None
+
+    def _moveTo(self, pt):
+        self._start = pt
+
+    def _lineTo(self, pt):
+        x0, y0 = self._getCurrentPoint()
+        if (x0, y0) != pt:
+            self.segments.append((x0, y0, pt[0], pt[1]))
+
+    def _curveToOne(self, pt1, pt2, pt3):
+        x0, y0 = self._getCurrentPoint()
+        for i in range(1, curveSteps + 1):
+            t = i / curveSteps
+            mt = 1 - t
+            x = (
+                mt**3 * x0
+                + 3 * mt**2 * t * pt1[0]
+                + 3 * mt * t**2 * pt2[0]
+                + t**3 * pt3[0]
+            )
+            y = (
+                mt**3 * y0
+                + 3 * mt**2 * t * pt1[1]
+                + 3 * mt * t**2 * pt2[1]
+                + t**3 * pt3[1]
+            )
+            self.segments.append((x0, y0, x, y))
+            x0, y0 = x, y
+
+    def _closePath(self):
+        if self._start is not None:
+            self._lineTo(self._start)
+        self._start = None
+
+    def _endPath(self):
+        self._start = None
+
+
+class GlyphShape(object):
+    # The flattened outline of a glyph with its bounding box
+
+    def __init__(self, glyph, glyphSet):
+        pen = FlatteningPen(glyphSet)
+        glyph.draw(pen)
+        self.segments = pen.segments
+        if self.segments:
+            xs = [s[0] for s in self.segments] + [s[2] for s in self.segments]
+            ys = [s[1] for s in self.segments] + [s[3] for s in self.segments]
+            self.bounds = (min(xs), min(ys), max(xs), max(ys))
+        else:
+            self.bounds = None
+
+    def getMovedSegments(self, dx, dy):
+        return [
+            (x0 + dx, y0 + dy, x1 + dx, y1 + dy)
+            for x0, y0, x1, y1 in self.segments
+        ]
+
+    def getSegmentsNear(self, bounds, margin, dx=0, dy=0):
+        # Return the segments, moved by (dx, dy), whose bounding box is
+        # within margin of the bounds
+        xMin, yMin, xMax, yMax = bounds
+        xMin -= margin + dx
+        yMin -= margin + dy
+        xMax += margin - dx
+        yMax += margin - dy
+        return [
+            (x0 + dx, y0 + dy, x1 + dx, y1 + dy)
+            for x0, y0, x1, y1 in self.segments
+            if min(x0, x1) <= xMax
+            and max(x0, x1) >= xMin
+            and min(y0, y1) <= yMax
+            and max(y0, y1) >= yMin
+        ]
+
+
+def _getBoxDistance(a, b):
+    # Distance between two bounding boxes, 0 if they overlap
+    dx = max(a[0] - b[2], b[0] - a[2], 0)
+    dy = max(a[1] - b[3], b[1] - a[3], 0)
+    return hypot(dx, dy)
+
+
+def _getPointSegmentDistance(px, py, segment):
+    x0, y0, x1, y1 = segment
+    vx = x1 - x0
+    vy = y1 - y0
+    length2 = vx * vx + vy * vy
+    if length2 == 0:
+        return hypot(px - x0, py - y0)
+    t = max(0, min(1, ((px - x0) * vx + (py - y0) * vy) / length2))
+    return hypot(px - x0 - t * vx, py - y0 - t * vy)
+
+
+def _segmentsIntersect(a, b):
+    def orientation(x0, y0, x1, y1, x2, y2):
+        return (x1 - x0) * (y2 - y0) - (y1 - y0) * (x2 - x0)
+
+    d1 = orientation(b[0], b[1], b[2], b[3], a[0], a[1])
+    d2 = orientation(b[0], b[1], b[2], b[3], a[2], a[3])
+    d3 = orientation(a[0], a[1], a[2], a[3], b[0], b[1])
+    d4 = orientation(a[0], a[1], a[2], a[3], b[2], b[3])
+    return d1 * d2 <= 0 and d3 * d4 <= 0 and (d1, d2, d3, d4) != (0, 0, 0, 0)
+
+
+def _getSegmentDistance(a, b):
+    if _segmentsIntersect(a, b):
+        return 0
+    return min(
+        _getPointSegmentDistance(a[0], a[1], b),
+        _getPointSegmentDistance(a[2], a[3], b),
+        _getPointSegmentDistance(b[0], b[1], a),
+        _getPointSegmentDistance(b[2], b[3], a),
+    )
+
+
+def _isInside(px, py, segments):
+    # Even-odd rule
+    inside = False
+    for x0, y0, x1, y1 in segments:
+        if (y0 > py) != (y1 > py):
+            if px < x0 + (py - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+    return inside
+
+
+def _getCrossings(segment, otherSegments):
+    # Return the sorted positions (0 to 1) along the segment where it
+    # crosses any of otherSegments
+    x0, y0, x1, y1 = segment
+    rx = x1 - x0
+    ry = y1 - y0
+    crossings = []
+    for qx0, qy0, qx1, qy1 in otherSegments:
+        sx = qx1 - qx0
+        sy = qy1 - qy0
+        denominator = rx * sy - ry * sx
+        if denominator == 0:
+            continue
+        ex = qx0 - x0
+        ey = qy0 - y0
+        t = (ex * sy - ey * sx) / denominator
+        u = (ex * ry - ey * rx) / denominator
+        if 0 <= t <= 1 and 0 <= u <= 1:
+            crossings.append(t)
+    return sorted(crossings)
+
+
+def _getPenetration(segments, otherSegments):
+    # The largest distance of any point of segments that lies inside of
+    # otherSegments to the outline of otherSegments. Besides the start
+    # points, the middle of each piece of a segment between two crossings
+    # is tested, so outlines that cross without a point inside the other
+    # one, like a bar across a stem, get a depth as well.
+    depth = 0
+    for segment in segments:
+        x0, y0, x1, y1 = segment
+        points = [(x0, y0)]
+        crossings = _getCrossings(segment, otherSegments)
+        for t0, t1 in zip(crossings, crossings[1:]):
+            t = (t0 + t1) / 2
+            points.append((x0 + t * (x1 - x0), y0 + t * (y1 - y0)))
+        for x, y in points:
+            if _isInside(x, y, otherSegments):
+                depth = max(
+                    depth,
+                    min(
+                        _getPointSegmentDistance(x, y, s)
+                        for s in otherSegments
+                    ),
+                )
+    return depth
+
+
+def measurePair(baseShape, markShape, dx, dy, clearance=defaultClearance):
+    # Return the distance between the base outline and the mark outline
+    # moved by (dx, dy), or None if they are further apart than clearance.
+    # Overlapping outlines return the negative penetration depth.
+    if baseShape.bounds is None or markShape.bounds is None:
+        return None
+    markBounds = (
+        markShape.bounds[0] + dx,
+        markShape.bounds[1] + dy,
+        markShape.bounds[2] + dx,
+        markShape.bounds[3] + dy,
+    )
+    if _getBoxDistance(baseShape.bounds, markBounds) > clearance:
+        return None
+
+    baseSegments = baseShape.getSegmentsNear(markBounds, clearance)
+    markSegments = markShape.getSegmentsNear(
+        baseShape.bounds, clearance, dx, dy
+    )
+    distance = None
+    for a in baseSegments:
+        for b in markSegments:
+            d = _getSegmentDistance(a, b)
+            if distance is None or d < distance:
+                distance = d
+                if d == 0:
+                    break
+        if distance == 0:
+            break
+
+    allMarkSegments = markShape.getMovedSegments(dx, dy)
+    # Outlines that don't cross may still overlap if one glyph is inside
+    # of the other
+    x, y = allMarkSegments[0][:2]
+    bx, by = baseShape.segments[0][:2]
+    if (
+        distance == 0
+        or _isInside(x, y, baseShape.segments)
+        or _isInside(bx, by, allMarkSegments)
+    ):
+        depth = max(
+            _getPenetration(allMarkSegments, baseShape.segments),
+            _getPenetration(baseShape.segments, allMarkSegments),
+        )
+        # Outlines that only touch, e.g. a mark that sits on the edge of
+        # the base, have no depth and no clearance
+        if depth == 0:
+            return 0
+        return -max(depth, minimumOverlap)
+    if distance is None or distance > clearance:
+        return None
+    return distance
+
+
+def checkFont(font, clearance=defaultClearance, limit=defaultLimit):
+    # Return the collisions of one font, worst first, at most limit
+    fontName = getFontName(font)
+    fontAnchors = FontAnchors(font)
+    anchorGlyphs = fontAnchors.anchorGlyphs
+    positions = fontAnchors.anchorPositions
+    shapes = {}
+
+    def getShape(glyphName):
+        if glyphName not in shapes:
+            shapes[glyphName] = GlyphShape(font[glyphName], font)
+        return shapes[glyphName]
+
+    collisions = []
+    for markAnchorName in sorted(anchorGlyphs):
+        anchorName = markAnchorName[1:]
+        if (
+            not markAnchorName.startswith("_")
+            or anchorName not in anchorGlyphs
+        ):
+            continue
+        for baseName in anchorGlyphs[anchorName]:
+            bx, by = positions[baseName, anchorName]
+            for markName in anchorGlyphs[markAnchorName]:
+                if markName == baseName:
+                    continue
+                mx, my = positions[markName, markAnchorName]
+                distance = measurePair(
+                    getShape(baseName),
+                    getShape(markName),
+                    bx - mx,
+                    by - my,
+                    clearance,
+                )
+                if distance is not None:
+                    collisions.append(
+                        {
+                            "font": fontName,
+                            "base": baseName,
+                            "mark": markName,
+                            "anchor": anchorName,
+                            "distance": distance,
+                        }
+                    )
+    collisions.sort(key=lambda c: (c["distance"], c["base"], c["mark"]))
+    if limit is not None:
+        collisions = collisions[:limit]
+    return collisions
+
+
+def checkFonts(fonts, clearance=defaultClearance, limit=defaultLimit):
+    # Check open font objects one after the other
+    return [checkFont(font, clearance, limit) for font in fonts]
+
+
+def _checkPath(args):
+    from fontParts.world import OpenFont
+
+    path, clearance, limit = args
+    return checkFont(OpenFont(path), clearance, limit)
+
+
+def checkPaths(
+    paths, clearance=defaultClearance, limit=defaultLimit, workers=None
+):
+    # Check UFO files in parallel, one process per font
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                _checkPath, [(path, clearance, limit) for path in paths]
+            )
+        )
+
+
+def formatCollision(collision):
+    if collision["distance"] < 0:
+        message = "overlap of %i units" % -collision["distance"]
+    else:
+        message = "clearance of %i units" % collision["distance"]
+    return "%s /%s + /%s at '%s': %s" % (
+        collision["font"],
+        collision["base"],
+        collision["mark"],
+        collision["anchor"],
+        message,
+    )
+
+
+def main(args=None):
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(
+        description="Find marks that collide with their base glyphs."
+    )
+    parser.add_argument("ufos", nargs="+", metavar="UFO")
+    parser.add_argument(
+        "--clearance",
+        type=int,
+        default=defaultClearance,
+        help="Report marks that are closer than this to the base outline",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=defaultLimit,
+        help="Maximum number of collisions to report per font",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    options = parser.parse_args(args)
+    results = checkPaths(
+        options.ufos, options.clearance, options.limit, options.workers
+    )
+    overlaps = 0
+    for collisions in results:
+        for collision in collisions:
+            print(formatCollision(collision))
+            if collision["distance"] < 0:
+                overlaps += 1
+    print("%i overlapping marks found." % overlaps)
+    return 1 if overlaps else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
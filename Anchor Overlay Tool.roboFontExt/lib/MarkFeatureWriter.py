@@ -0,0 +1,194 @@
+"""
+Generate mark and mkmk feature code from the anchors of a font.
+
+Each mark anchor name (e.g. "_top") with a matching base anchor name
+("top") becomes an anchor class. Glyphs that have the mark anchor go into
+the mark class; glyphs with the base anchor become bases in the mark
+feature, or base marks in the mkmk feature if they are marks themselves,
+i.e. have any anchor starting with an underscore.
+
+The anchors are taken from the FontAnchors index, which is synced with the
+font before each build, so only changed glyphs are re-read. The feature
+code of an anchor class is only regenerated when one of its anchors has
+changed:
+
+    writer = MarkFeatureWriter.forFont(font)
+    fea = writer.getFeatureText()
+    # ... edit some anchors ...
+    fea = writer.getFeatureText()  # regenerates the changed classes only
+
+Ligature anchors (mark-to-ligature attachment) are not supported.
+"""
+
+import re
+from weakref import WeakKeyDictionary
+
+from FontAnchors import FontAnchors
+
+
+invalidNameCharacters = re.compile(r"[^A-Za-z0-9_.]")
+
+
+def getFeatureName(anchorName):
+    # A name that can be used for classes and lookups in feature code
+    return invalidNameCharacters.sub("_", anchorName)
+
+
+def formatAnchor(position):
+    return "<anchor %i %i>" % tuple(int(round(v)) for v in position)
+
+
+class MarkFeatureWriter(object):
+    _cache = WeakKeyDictionary()
+
+    def __init__(self, font, fontAnchors=None):
+        self.font = font
+        if fontAnchors is None:
+            fontAnchors = FontAnchors(font)
+        self.fontAnchors = fontAnchors
+        # anchor class name -> (signature, feature code blocks)
+        self._blocks = {}
+        self.numChangedClasses = 0
+
+    @classmethod
+    def forFont(cls, font):
+        # Return the cached writer for the font, so repeated builds only
+        # regenerate the anchor classes that changed
+        key = font.naked()
+        writer = cls._cache.get(key)
+        if writer is None:
+            writer = cls(font)
+            cls._cache[key] = writer
+        return writer
+
+    def _isMark(self, glyphName):
+        return any(
+            name.startswith("_")
+            for name in self.fontAnchors.glyphAnchorNames.get(glyphName, [])
+        )
+
+    def getAnchorClassNames(self):
+        # Base anchor names that have a matching mark anchor name
+        anchorGlyphs = self.fontAnchors.anchorGlyphs
+        return sorted(
+            name[1:]
+            for name in anchorGlyphs
+            if name.startswith("_")
+            and len(name) > 1
+            and name[1:] in anchorGlyphs
+        )
+
+    def _getSignature(self, anchorName):
+        # The anchors that make up the feature code of one anchor class
+        anchorGlyphs = self.fontAnchors.anchorGlyphs
+        positions = self.fontAnchors.anchorPositions
+        markName = "_" + anchorName
+        marks = tuple(
+            sorted(
+                (glyphName, positions[glyphName, markName])
+                for glyphName in anchorGlyphs[markName]
+            )
+        )
+        bases = tuple(
+            sorted(
+                (
+                    glyphName,
+                    positions[glyphName, anchorName],
+                    self._isMark(glyphName),
+                )
+                for glyphName in anchorGlyphs[anchorName]
+            )
+        )
+        return marks, bases
+
+    def _buildBlocks(self, anchorName, signature):
+        # Return the markClass definitions, the mark lookup and the mkmk
+        # lookup of one anchor class. Lookups are (lookup name, feature
+        # code) tuples; empty lookups are None.
+        marks, bases = signature
+        name = getFeatureName(anchorName)
+        className = "@MC_%s" % name
+        markClasses = "".join(
+            "markClass %s %s %s;\n" % (glyphName, formatAnchor(pos), className)
+            for glyphName, pos in marks
+        )
+        lookups = []
+        for feature, isMark in (("mark", False), ("mkmk", True)):
+            rules = [
+                "    pos %s %s %s mark %s;\n"
+                % (
+                    "mark" if isMark else "base",
+                    glyphName,
+                    formatAnchor(pos),
+                    className,
+                )
+                for glyphName, pos, baseIsMark in bases
+                if baseIsMark == isMark
+            ]
+            if rules:
+                lookupName = "%s_%s" % (feature, name)
+                lookups.append(
+                    (
+                        lookupName,
+                        "lookup %s {\n%s} %s;\n"
+                        % (lookupName, "".join(rules), lookupName),
+                    )
+                )
+            else:
+                lookups.append(None)
+        return markClasses, lookups[0], lookups[1]
+
+    def update(self):
+        # Sync the anchor index with the font and regenerate the feature
+        # code of the anchor classes that changed. Returns the names of the
+        # regenerated classes.
+        self.fontAnchors.sync()
+        changed = []
+        blocks = {}
+        for anchorName in self.getAnchorClassNames():
+            signature = self._getSignature(anchorName)
+            cached = self._blocks.get(anchorName)
+            if cached is None or cached[0] != signature:
+                cached = (signature, self._buildBlocks(anchorName, signature))
+                changed.append(anchorName)
+            blocks[anchorName] = cached
+        self._blocks = blocks
+        self.numChangedClasses = len(changed)
+        return changed
+
+    def getFeatureText(self):
+        # Return the feature code for the mark and mkmk features
+        self.update()
+        markClasses = []
+        features = {"mark": [], "mkmk": []}
+        for anchorName in sorted(self._blocks):
+            classes, markLookup, mkmkLookup = self._blocks[anchorName][1]
+            markClasses.append(classes)
+            for feature, lookup in (
+                ("mark", markLookup),
+                ("mkmk", mkmkLookup),
+            ):
+                if lookup is not None:
+                    features[feature].append(lookup)
+        fea = "".join(markClasses)
+        for feature in ("mark", "mkmk"):
+            lookups = features[feature]
+            if not lookups:
+                continue
+            fea += "\n" + "\n".join(text for _, text in lookups)
+            fea += "\nfeature %s {\n" % feature
+            for lookupName, _ in lookups:
+                fea += "    lookup %s;\n" % lookupName
+            fea += "} %s;\n" % feature
+        return fea
+
+    def compileGPOS(self, ttFont):
+        # Compile the features into the GPOS table of a fontTools TTFont,
+        # which must contain all glyphs of the font. Existing GPOS
+        # lookups are replaced.
+        from fontTools.feaLib.builder import addOpenTypeFeaturesFromString
+
+        addOpenTypeFeaturesFromString(
+            ttFont, self.getFeatureText(), tables=["GPOS"]
+        )
+        return ttFont["GPOS"]
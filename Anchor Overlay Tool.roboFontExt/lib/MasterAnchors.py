@@ -0,0 +1,166 @@
+"""
+Anchor indexes of all masters of a designspace, combined into one
+structure, for checking anchor compatibility and recomposing glyphs in all
+masters at once.
+"""
+
+from os.path import normpath
+
+from fontTools.designspaceLib import DesignSpaceDocument
+
+from EditTransaction import EditTransaction
+from FontAnchors import FontAnchors, getFontName
+from Recomposer import jkKernInfo, repositionComponents
+
+
+def openFont(path, hiddenFonts=None):
+    # Use the font if it is open already, otherwise open it without UI.
+    # Fonts opened here are appended to hiddenFonts, if a list is given, so
+    # the caller can close them again.
+    from mojo.roboFont import AllFonts, OpenFont
+
+    for font in AllFonts():
+        if font.path is not None and normpath(font.path) == normpath(path):
+            return font
+    font = OpenFont(path, showInterface=False)
+    if hiddenFonts is not None:
+        hiddenFonts.append(font)
+    return font
+
+
+class MasterAnchors(object):
+    def __init__(self, fonts, names=None, locations=None, axes=None):
+        self.fonts = list(fonts)
+        if names is None:
+            names = [getFontName(f) for f in self.fonts]
+        self.names = names
+        self.locations = locations
+        self.axes = axes
+        self.fontAnchors = [FontAnchors(f) for f in self.fonts]
+        self._buildIndex()
+
+    @classmethod
+    def fromDesignspace(cls, path, openFont):
+        # Load the masters of a designspace file. openFont is called with
+        # the path of each source UFO and must return a font object.
+        doc = DesignSpaceDocument.fromfile(path)
+        fonts = []
+        names = []
+        locations = []
+        for source in doc.sources:
+            if source.layerName is not None:
+                # Sparse masters in a layer are not supported
+                continue
+            fonts.append(openFont(source.path))
+            names.append(source.styleName or source.name)
+            locations.append(source.location)
+        return cls(fonts, names, locations, doc.axes)
+
+    def _buildIndex(self):
+        # glyph name -> anchor name -> list of positions, one per master,
+        # None where the anchor is missing
+        self.glyphAnchors = {}
+        numMasters = len(self.fonts)
+        for i, fontAnchors in enumerate(self.fontAnchors):
+            for (
+                glyphName,
+                anchorName,
+            ), pos in fontAnchors.anchorPositions.items():
+                anchors = self.glyphAnchors.setdefault(glyphName, {})
+                if anchorName not in anchors:
+                    anchors[anchorName] = [None] * numMasters
+                anchors[anchorName][i] = pos
+
+    def update(self):
+        # Re-read the anchors from all masters
+        for fontAnchors in self.fontAnchors:
+            fontAnchors._readFromFont(fontAnchors.font)
+        self._buildIndex()
+
+    def updateGlyphs(self, glyphNames):
+        # Re-read the anchors of some glyphs in the masters where they were
+        # changed, and rebuild their index entries. Returns True if any
+        # master was re-read.
+        changed = False
+        for fontAnchors in self.fontAnchors:
+            for glyphName in glyphNames:
+                if fontAnchors.syncGlyph(glyphName):
+                    changed = True
+        if not changed:
+            return False
+        numMasters = len(self.fonts)
+        for glyphName in glyphNames:
+            anchors = {}
+            for i, fontAnchors in enumerate(self.fontAnchors):
+                for anchorName in fontAnchors.glyphAnchorNames.get(
+                    glyphName, []
+                ):
+                    if anchorName not in anchors:
+                        anchors[anchorName] = [None] * numMasters
+                    anchors[anchorName][i] = fontAnchors.anchorPositions[
+                        glyphName, anchorName
+                    ]
+            if anchors:
+                self.glyphAnchors[glyphName] = anchors
+            else:
+                self.glyphAnchors.pop(glyphName, None)
+        return True
+
+    def getCompatibilityErrors(self, glyphNames=None):
+        # Return a list of messages about anchors that are missing in some
+        # masters. If no glyph names are given, all glyphs are checked.
+        if glyphNames is None:
+            glyphNames = self.glyphAnchors.keys()
+        errors = []
+        for glyphName in sorted(glyphNames):
+            anchors = self.glyphAnchors.get(glyphName, {})
+            for anchorName in sorted(anchors):
+                for i, pos in enumerate(anchors[anchorName]):
+                    if pos is None and glyphName in self.fonts[i]:
+                        errors.append(
+                            "Anchor '%s' in /%s is missing in master '%s'."
+                            % (anchorName, glyphName, self.names[i])
+                        )
+        return errors
+
+    def getComponentGlyphNames(self, glyphNames):
+        # Return the glyph names plus the names of all glyphs they use as
+        # components, directly or nested, in any master
+        result = set()
+        stack = list(glyphNames)
+        while stack:
+            glyphName = stack.pop()
+            if glyphName in result:
+                continue
+            result.add(glyphName)
+            for font in self.fonts:
+                if glyphName in font:
+                    stack.extend(
+                        c.baseGlyph for c in font[glyphName].components
+                    )
+        return result
+
+    def recompose(self, glyphNames, report=None, dryRun=None):
+        # Recompose the glyphs in all masters. Anchor compatibility of the
+        # glyphs and their components is checked first; the list of errors
+        # is returned. The changes are recorded in the RecompositionReport,
+        # if one is given, which also decides whether it is a dry run.
+        errors = self.getCompatibilityErrors(
+            self.getComponentGlyphNames(glyphNames)
+        )
+        for error in errors:
+            print("ERROR: %s" % error)
+        for font in self.fonts:
+            kern_info = jkKernInfo(font)
+            with EditTransaction(font, "Reposition components") as transaction:
+                for glyphname in glyphNames:
+                    if glyphname in font:
+                        report = repositionComponents(
+                            glyphname,
+                            font,
+                            kern_info,
+                            transaction=transaction,
+                            report=report,
+                            dryRun=dryRun,
+                        )
+        return errors
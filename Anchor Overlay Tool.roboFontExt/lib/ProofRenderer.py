@@ -0,0 +1,282 @@
+"""
+Render contact sheets of the mark attachment of a font, without RoboFont.
+
+Each cell shows a base glyph with one of the marks that attach to it, as
+the overlay would draw it. With combine=True, each cell shows a base
+glyph with all of its marks at once, exactly like the overlay. The cells
+are taken from the same draw plan as the overlay. When rendering from
+RoboFont, anchors and glyphs hidden in the overlay panel are left out of
+the proofs too. From the command line, nothing is hidden, because the
+hidden names are stored in RoboFont's extension settings.
+
+Pages are written as SVG, which needs nothing but fontTools, as PDF, which
+needs reportlab, or as PNG, which needs reportlab and rlPyCairo. One file
+is written per page. From the command line, the pages of all UFOs are
+rendered in parallel:
+
+    python ProofRenderer.py --format pdf --output proofs Regular.ufo Bold.ufo
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+import sys
+from xml.sax.saxutils import escape
+
+from fontTools.pens.svgPathPen import SVGPathPen
+
+from DrawPlan import getDrawPlan
+from FontAnchors import FontAnchors, getFontName
+
+
+formats = ("svg", "pdf", "png")
+
+defaultColumns = 8
+defaultRows = 10
+
+# Cell size and label height in points
+cellSize = 90
+labelHeight = 12
+
+baseColor = (0, 0, 0)
+markColor = (0.1, 0.35, 0.8)
+
+
+def getCells(font, combine=False):
+    # Return a list of (base glyph name, draw plan) for all glyphs that have
+    # marks attached, in glyph order
+    fontAnchors = FontAnchors(font)
+    cells = []
+    for glyphName in font.glyphOrder:
+        if glyphName not in font:
+            continue
+        plan = getDrawPlan(fontAnchors, font[glyphName], baseOnly=True)
+        if not plan:
+            continue
+        if combine:
+            cells.append((glyphName, plan))
+        else:
+            cells.extend((glyphName, [entry]) for entry in plan)
+    return cells
+
+
+def getPages(cells, columns=defaultColumns, rows=defaultRows):
+    size = columns * rows
+    return [cells[i : i + size] for i in range(0, len(cells), size)]
+
+
+def getPageLayout(font, cells, columns):
+    # Return the page size, the list of (glyph name, transform, color) to
+    # draw, and the list of (x, y, text) labels, in a y-up coordinate
+    # system in points
+    upm = font.info.unitsPerEm or 1000
+    descender = font.info.descender or -0.25 * upm
+    scale = cellSize / (1.6 * upm)
+    rows = (len(cells) + columns - 1) // columns
+    width = columns * cellSize
+    height = rows * (cellSize + labelHeight)
+    items = []
+    labels = []
+    for i, (baseName, plan) in enumerate(cells):
+        column = i % columns
+        row = i // columns
+        left = column * cellSize
+        bottom = height - (row + 1) * (cellSize + labelHeight) + labelHeight
+        x = left + (cellSize - font[baseName].width * scale) / 2
+        y = bottom - descender * scale + 0.1 * cellSize
+        items.append((baseName, (scale, 0, 0, scale, x, y), baseColor))
+        for markName, dx, dy in plan:
+            items.append(
+                (
+                    markName,
+                    (scale, 0, 0, scale, x + dx * scale, y + dy * scale),
+                    markColor,
+                )
+            )
+        if len(plan) == 1:
+            label = "%s + %s" % (baseName, plan[0][0])
+        else:
+            label = baseName
+        labels.append((left + cellSize / 2, bottom - labelHeight + 3, label))
+    return (width, height), items, labels
+
+
+def _getSVGColor(color):
+    return "rgb(%i,%i,%i)" % tuple(int(round(c * 255)) for c in color)
+
+
+def renderSVG(font, cells, path, columns=defaultColumns):
+    (width, height), items, labels = getPageLayout(font, cells, columns)
+    glyphPaths = {}
+    svg = [
+        '<svg xmlns="http://www.w3.org/2000/svg" width="%i" height="%i" '
+        'viewBox="0 0 %i %i">\n' % (width, height, width, height),
+        '<g transform="matrix(1 0 0 -1 0 %i)">\n' % height,
+    ]
+    for glyphName, transform, color in items:
+        if glyphName not in glyphPaths:
+            pen = SVGPathPen(font)
+            font[glyphName].draw(pen)
+            glyphPaths[glyphName] = pen.getCommands()
+        svg.append(
+            '<path transform="matrix(%s)" fill="%s" d="%s"/>\n'
+            % (
+                " ".join("%g" % v for v in transform),
+                _getSVGColor(color),
+                glyphPaths[glyphName],
+            )
+        )
+    svg.append("</g>\n")
+    for x, y, text in labels:
+        svg.append(
+            '<text x="%g" y="%g" font-family="sans-serif" font-size="7" '
+            'text-anchor="middle">%s</text>\n' % (x, height - y, escape(text))
+        )
+    svg.append("</svg>\n")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(svg))
+
+
+def renderReportLab(font, cells, path, columns=defaultColumns, fmt="pdf"):
+    from fontTools.pens.reportLabPen import ReportLabPen
+    from reportlab.graphics import renderPDF, renderPM
+    from reportlab.graphics.shapes import Drawing, Group, Path, String
+    from reportlab.lib.colors import Color
+
+    (width, height), items, labels = getPageLayout(font, cells, columns)
+    drawing = Drawing(width, height)
+    for glyphName, transform, color in items:
+        pen = ReportLabPen(
+            font, Path(fillColor=Color(*color), strokeColor=None)
+        )
+        font[glyphName].draw(pen)
+        group = Group(pen.path)
+        group.transform = transform
+        drawing.add(group)
+    for x, y, text in labels:
+        drawing.add(String(x, y, text, fontSize=7, textAnchor="middle"))
+    if fmt == "png":
+        renderPM.drawToFile(drawing, path, fmt="PNG")
+    else:
+        renderPDF.drawToFile(drawing, path)
+
+
+def renderPage(font, cells, path, fmt="svg", columns=defaultColumns):
+    # Render one page of cells to a file
+    if fmt == "svg":
+        renderSVG(font, cells, path, columns)
+    else:
+        renderReportLab(font, cells, path, columns, fmt)
+    return path
+
+
+def _getPagePath(outputDir, fontName, pageIndex, fmt):
+    return os.path.join(
+        outputDir,
+        "%s_%03i.%s" % (fontName.replace(" ", "-"), pageIndex + 1, fmt),
+    )
+
+
+def renderFont(
+    font,
+    outputDir,
+    fmt="svg",
+    combine=False,
+    columns=defaultColumns,
+    rows=defaultRows,
+):
+    # Render all pages of one font object, one after the other. Returns the
+    # list of written files.
+    fontName = getFontName(font)
+    pages = getPages(getCells(font, combine), columns, rows)
+    return [
+        renderPage(
+            font,
+            cells,
+            _getPagePath(outputDir, fontName, i, fmt),
+            fmt,
+            columns,
+        )
+        for i, cells in enumerate(pages)
+    ]
+
+
+# Fonts opened by a worker process, by path
+_openFonts = {}
+
+
+def _renderPagePath(args):
+    from fontParts.world import OpenFont
+
+    fontPath, cells, path, fmt, columns = args
+    if fontPath not in _openFonts:
+        _openFonts[fontPath] = OpenFont(fontPath)
+    return renderPage(_openFonts[fontPath], cells, path, fmt, columns)
+
+
+def renderPaths(
+    fontPaths,
+    outputDir,
+    fmt="svg",
+    combine=False,
+    columns=defaultColumns,
+    rows=defaultRows,
+    workers=None,
+):
+    # Render UFO files. The pages of all fonts are spread over a process
+    # pool. Returns the list of written files.
+    from fontParts.world import OpenFont
+
+    jobs = []
+    for fontPath in fontPaths:
+        font = OpenFont(fontPath)
+        fontName = getFontName(font)
+        pages = getPages(getCells(font, combine), columns, rows)
+        for i, cells in enumerate(pages):
+            jobs.append(
+                (
+                    fontPath,
+                    cells,
+                    _getPagePath(outputDir, fontName, i, fmt),
+                    fmt,
+                    columns,
+                )
+            )
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_renderPagePath, jobs))
+
+
+def main(args=None):
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(
+        description="Render proofs of all base and mark combinations."
+    )
+    parser.add_argument("ufos", nargs="+", metavar="UFO")
+    parser.add_argument("--output", default=".", help="Output folder")
+    parser.add_argument("--format", choices=formats, default="svg")
+    parser.add_argument(
+        "--combine",
+        action="store_true",
+        help="Show all marks of a base glyph in one cell",
+    )
+    parser.add_argument("--columns", type=int, default=defaultColumns)
+    parser.add_argument("--rows", type=int, default=defaultRows)
+    parser.add_argument("--workers", type=int, default=None)
+    options = parser.parse_args(args)
+    if not os.path.isdir(options.output):
+        os.makedirs(options.output)
+    paths = renderPaths(
+        options.ufos,
+        options.output,
+        options.format,
+        options.combine,
+        options.columns,
+        options.rows,
+        options.workers,
+    )
+    print("%i pages written to '%s'." % (len(paths), options.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Recompose the selected glyphs in all masters of a designspace, and report
+anchors that are not compatible between the masters.
+"""
+
+from os.path import basename
+
+from mojo.UI import AskYesNoCancel, GetFile
+
+from MasterAnchors import MasterAnchors, openFont
+from RecompositionReport import RecompositionReport
+
+
+# Set to True to print every change instead of only a summary
+verbose = False
+
+hiddenFonts = []
+
+f = CurrentFont()
+
+glyphs = []
+
+if CurrentGlyph() is not None:
+    glyphs = [CurrentGlyph().name]
+elif f.selection:
+    glyphs = f.selection
+
+path = GetFile("Choose the designspace file", fileTypes=["designspace"])
+
+if path is not None and glyphs:
+    masters = MasterAnchors.fromDesignspace(
+        path, lambda fontPath: openFont(fontPath, hiddenFonts)
+    )
+    report = RecompositionReport(verbose=verbose)
+    errors = masters.recompose(glyphs, report)
+    if hiddenFonts:
+        # The masters that were not open are only saved if the user agrees,
+        # otherwise they are shown with their changes unsaved
+        answer = AskYesNoCancel(
+            "Save the recomposed masters that were not open?",
+            informativeText=", ".join(
+                basename(font.path) for font in hiddenFonts
+            ),
+        )
+        for font in hiddenFonts:
+            if answer == 1:
+                font.save()
+                font.close()
+            else:
+                font.openInterface()
+    print(report.getSummary())
+    print(
+        "Recomposed %i glyphs in %i masters, %i anchor compatibility "
+        "errors." % (len(glyphs), len(masters.fonts), len(errors))
+    )
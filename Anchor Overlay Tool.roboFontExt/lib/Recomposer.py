@@ -0,0 +1,277 @@
+"""
+Recompose glyphs, using anchor positions as reference for placement.
+Also resets the metrics of the composite to those of the base glyph(s).
+
+Jens Kutilek
+Version 0.1: 2013-05-28
+Version 0.2: 2014-08-05 - Implemented chained accents positioning
+Version 0.3: 2014-11-22 - Bug fixes for ligatures
+Version 0.4: 2016-02-03 - Support kerning when positioning ligature-style components
+"""
+
+from contextlib import nullcontext
+from operator import attrgetter
+from re import compile
+
+from EditTransaction import EditTransaction
+from FontAnchors import getFontName
+from GlyphClassifier import GlyphClassifier
+from GlyphGeometry import GlyphGeometry
+from RecompositionReport import RecompositionReport
+
+
+class jkKernInfo(object):
+    def __init__(self, font):
+        self.font = font
+        self.group_name_pattern = compile("^@MMK_*")
+        self.group_name_l_pattern = compile("^@MMK_L_*")
+        self.group_name_r_pattern = compile("^@MMK_R_*")
+        self._analyze_kerning()
+        self._kern_cache = {}
+
+    def is_kerning_group(self, name, side=None):
+        # Test if supplied name is a kerning group name
+        if side is None:
+            return self.group_name_pattern.search(name)
+        elif side == "l":
+            return self.group_name_l_pattern.search(name)
+        elif side == "r":
+            return self.group_name_r_pattern.search(name)
+        return False
+
+    def _analyze_kerning(self):
+        self.kerning = self.font.kerning
+        self.group_info = {
+            "l": {},
+            "r": {},
+        }
+        for group_name, group_content in self.font.groups.items():
+            if self.is_kerning_group(group_name, "l"):
+                for glyph_name in group_content:
+                    self.group_info["l"][glyph_name] = group_name
+            if self.is_kerning_group(group_name, "r"):
+                for glyph_name in group_content:
+                    self.group_info["r"][glyph_name] = group_name
+
+    def get_group_for_glyph(self, glyph_name, side):
+        group_name = self.group_info[side].get(glyph_name, None)
+        return group_name
+
+    def getKernValue(self, left, right):
+        # Kerning doesn't change during a recomposition run, so the values
+        # are memoized per pair
+        pair = (left, right)
+        if pair not in self._kern_cache:
+            self._kern_cache[pair] = self._getKernValue(left, right)
+        return self._kern_cache[pair]
+
+    def _getKernValue(self, left, right):
+        left_group = self.get_group_for_glyph(left, "l")
+        right_group = self.get_group_for_glyph(right, "r")
+        pair_value = self.kerning.get((left, right), None)
+        if pair_value is not None:
+            return pair_value
+        lg_value = self.kerning.get((left_group, right), None)
+        if lg_value is not None:
+            return lg_value
+        rg_value = self.kerning.get((left, right_group), None)
+        if rg_value is not None:
+            return rg_value
+        group_value = self.kerning.get((left_group, right_group), None)
+        if group_value is None:
+            group_value = 0
+        return group_value
+
+
+def getMatchingAnchorName(name):
+    # returns "inverted" anchor name, i.e. with leading underscore added or
+    # removed
+    if name[0] == "_":
+        return name[1:]
+    else:
+        return "_" + name
+
+
+def getBaseGlyphName(font, name):
+    g = font[name]
+    baseGlyphCandidates = []
+    for c in g.components:
+        baseGlyphCandidates.append(c.baseGlyph)
+    numCandidates = len(baseGlyphCandidates)
+    if numCandidates == 0:
+        return name
+    elif numCandidates == 1:
+        return baseGlyphCandidates[0]
+    else:
+        # TODO: plausibility check if the base glyph really is the first
+        # component.
+        # print(baseGlyphCandidates)
+        return baseGlyphCandidates[0]
+
+
+def clearAnchors(glyph):
+    for a in glyph.anchors:
+        glyph.removeAnchor(a)
+
+
+def deleteAnchor(glyph, name, position):
+    for a in glyph.anchors:
+        if a.name == name and a.position == position:
+            glyph.removeAnchor(a)
+            break
+
+
+def getLigatureLayout(componentNames, font, kern_info, getWidth):
+    # Put the components next to each other, applying kerning between them.
+    # getWidth(glyph name) returns the width of a component. Returns the
+    # list of offsets and the total width.
+    offsets = []
+    totalWidth = 0
+    prevComponentName = None
+    for name in componentNames:
+        kerning = 0
+        if prevComponentName is not None:
+            kerning = kern_info.getKernValue(prevComponentName, name) or 0
+        offsets.append((int(round(totalWidth + kerning)), 0))
+        totalWidth += getWidth(name) + kerning
+        prevComponentName = name
+    return offsets, totalWidth
+
+
+def getMarkLayout(componentNames, font):
+    # Attach each component to the first matching anchor of the previous
+    # components. Returns the list of offsets and the list of components
+    # for which no matching anchor was found.
+    anchor_map = {}
+    offsets = []
+    unmatched = []
+    for i, name in enumerate(componentNames):
+        offset = None
+        mark_anchors = sorted(font[name].anchors, key=attrgetter("name"))
+        for mark_anchor in mark_anchors:
+            if i == 0:
+                if mark_anchor.name.startswith("_"):
+                    continue
+                anchor_map[mark_anchor.name] = mark_anchor.position
+
+            base_anchor_name = getMatchingAnchorName(mark_anchor.name)
+            if base_anchor_name in anchor_map:
+                x, y = anchor_map[base_anchor_name]
+                d = (x - mark_anchor.x, y - mark_anchor.y)
+                offset = (int(round(d[0])), int(round(d[1])))
+                # Base anchors of this component are available to the
+                # following components
+                for temp_anchor in reversed(mark_anchors):
+                    if temp_anchor.name.startswith("_"):
+                        break
+                    anchor_map[temp_anchor.name] = (
+                        temp_anchor.x + d[0],
+                        temp_anchor.y + d[1],
+                    )
+                break
+
+        if offset is None:
+            if i > 0:
+                unmatched.append(name)
+            offset = (0, 0)
+        offsets.append(offset)
+    return offsets, unmatched
+
+
+def repositionComponents(
+    glyphname,
+    font,
+    kern_info,
+    geometry=None,
+    transaction=None,
+    classifier=None,
+    report=None,
+    dryRun=None,
+):
+    # The new component offsets and glyph width are computed first, then
+    # applied in one undo step with one change notification for the glyph.
+    # Pass an EditTransaction to recompose several glyphs in one go, and a
+    # GlyphClassifier to use other than the default rules. The widths of
+    # the components are read from the GlyphGeometry of the font.
+    # The changes are recorded in a RecompositionReport, which is returned.
+    # In a dry run, the changes are only recorded, not applied. A report
+    # that is passed in decides whether the run is a dry run.
+    if geometry is None:
+        geometry = GlyphGeometry.forFont(font)
+    if classifier is None:
+        classifier = GlyphClassifier.forFont(font)
+    if report is None:
+        report = RecompositionReport(dryRun=bool(dryRun))
+    elif dryRun is not None and dryRun != report.dryRun:
+        raise ValueError("dryRun doesn't match the dryRun of the report")
+    dryRun = report.dryRun
+    fontName = getFontName(font)
+    report.addGlyph(fontName, glyphname)
+
+    def getWidth(name):
+        # A dry run doesn't set the widths, so glyphs recomposed earlier in
+        # the run are measured with the width they would get
+        if dryRun:
+            return report.widths.get((fontName, name), geometry.getWidth(name))
+        return geometry.getWidth(name)
+
+    glyph = font[glyphname]
+    components = glyph.components
+    componentNames = [c.baseGlyph for c in components]
+
+    if not componentNames:
+        return report
+
+    classification = classifier.classify(glyphname)
+    if classification.isLigature:
+        # Handle as ligature resp. ignore anchors
+        offsets, totalWidth = getLigatureLayout(
+            componentNames, font, kern_info, getWidth
+        )
+    else:
+        # Handle as mark positioning
+        offsets, unmatched = getMarkLayout(componentNames, font)
+        for name in unmatched:
+            report.addWarning(
+                fontName,
+                glyphname,
+                "No matching anchor found for component %s, "
+                "setting offset to (0, 0)." % name,
+            )
+        totalWidth = sum(getWidth(name) for name in componentNames)
+
+    if classification.sumWidths:
+        # For ligatures, set width to width of all components combined
+        w = totalWidth
+    else:
+        # set width of glyph from baseglyph
+        w = getWidth(getBaseGlyphName(font, glyphname))
+
+    changes = [
+        (i, c, offset)
+        for i, (c, offset) in enumerate(zip(components, offsets))
+        if tuple(c.offset) != offset
+    ]
+    for i, c, offset in changes:
+        report.addComponentChange(
+            fontName, glyphname, i, c.baseGlyph, tuple(c.offset), offset
+        )
+    if w != glyph.width:
+        report.addWidthChange(fontName, glyphname, glyph.width, w)
+
+    if dryRun or (not changes and w == glyph.width):
+        return report
+
+    title = "Reposition components in /%s" % glyphname
+    if transaction is None:
+        context = EditTransaction(font, title)
+    else:
+        context = nullcontext(transaction)
+    with context as transaction:
+        glyph = transaction.getGlyph(glyphname, title)
+        for i, c, offset in changes:
+            c.offset = offset
+        if w != glyph.width:
+            glyph.width = w
+            geometry.clear(glyphname)
+    return report
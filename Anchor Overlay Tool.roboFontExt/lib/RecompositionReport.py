@@ -0,0 +1,114 @@
+from json import dumps
+
+
+class RecompositionReport(object):
+    # Collects the changes made (or, in a dry run, proposed) by
+    # repositionComponents.
+    #
+    # Each entry is a dict with a "type" of "component", "width" or
+    # "warning". Entries can be streamed as JSON Lines to an open text file
+    # while recomposing. By default only summary counts are printed; pass
+    # verbose=True to print every entry.
+
+    def __init__(self, stream=None, verbose=False, dryRun=False):
+        self.stream = stream
+        self.verbose = verbose
+        self.dryRun = dryRun
+        self.entries = []
+        self.numGlyphs = 0
+        self.modifiedGlyphs = set()
+        # New widths by (font name, glyph name), for dry runs
+        self.widths = {}
+
+    def _add(self, entry):
+        self.entries.append(entry)
+        if self.stream is not None:
+            self.stream.write(dumps(entry) + "\n")
+        if self.verbose:
+            print(self.formatEntry(entry))
+
+    def formatEntry(self, entry):
+        if entry["type"] == "component":
+            return "%s /%s: Move component %i (%s) %s -> %s" % (
+                entry["font"],
+                entry["glyph"],
+                entry["index"],
+                entry["component"],
+                tuple(entry["oldOffset"]),
+                tuple(entry["newOffset"]),
+            )
+        elif entry["type"] == "width":
+            return "%s /%s: Set width %s -> %s" % (
+                entry["font"],
+                entry["glyph"],
+                entry["oldWidth"],
+                entry["newWidth"],
+            )
+        return "%s /%s: WARNING: %s" % (
+            entry["font"],
+            entry["glyph"],
+            entry["message"],
+        )
+
+    def addGlyph(self, fontName, glyphName):
+        self.numGlyphs += 1
+
+    def addComponentChange(
+        self, fontName, glyphName, index, componentName, oldOffset, newOffset
+    ):
+        self.modifiedGlyphs.add((fontName, glyphName))
+        self._add(
+            {
+                "type": "component",
+                "font": fontName,
+                "glyph": glyphName,
+                "index": index,
+                "component": componentName,
+                "oldOffset": list(oldOffset),
+                "newOffset": list(newOffset),
+            }
+        )
+
+    def addWidthChange(self, fontName, glyphName, oldWidth, newWidth):
+        self.modifiedGlyphs.add((fontName, glyphName))
+        self.widths[fontName, glyphName] = newWidth
+        self._add(
+            {
+                "type": "width",
+                "font": fontName,
+                "glyph": glyphName,
+                "oldWidth": oldWidth,
+                "newWidth": newWidth,
+            }
+        )
+
+    def addWarning(self, fontName, glyphName, message):
+        self._add(
+            {
+                "type": "warning",
+                "font": fontName,
+                "glyph": glyphName,
+                "message": message,
+            }
+        )
+
+    def getCount(self, entryType):
+        return len([e for e in self.entries if e["type"] == entryType])
+
+    def getSummary(self):
+        if self.dryRun:
+            action = "would be"
+        else:
+            action = "were"
+        return (
+            "%i glyphs checked, %i %s modified: %i components moved, "
+            "%i widths changed, %i warnings."
+            % (
+                self.numGlyphs,
+                len(self.modifiedGlyphs),
+                action,
+                self.getCount("component"),
+                self.getCount("width"),
+                self.getCount("warning"),
+            )
+        )
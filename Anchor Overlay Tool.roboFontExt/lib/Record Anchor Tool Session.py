@@ -0,0 +1,11 @@
+"""
+Start recording the events of the active Anchor Tool, or stop recording
+and write them to AnchorTool_Session.jsonl in the Documents folder.
+"""
+
+from mojo.events import getActiveEventTool
+
+from EventRecording import toggleRecording
+
+
+toggleRecording(getActiveEventTool())
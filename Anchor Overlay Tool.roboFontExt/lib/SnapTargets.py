@@ -0,0 +1,158 @@
+"""
+Snapping targets for anchors, computed from the glyph outline.
+
+The targets are stored as a defcon representation, so they are computed
+once per outline change and then reused for every anchor nudge. Anchor
+changes don't invalidate them.
+"""
+
+from bisect import bisect_left, bisect_right
+
+from defcon import Glyph, registerRepresentationFactory
+
+from extensionID import extensionID
+
+
+representationName = "%s.snapTargets" % extensionID
+
+# Heights relative to the outline bounding box at which stem centres and
+# the optical centre are measured
+sampleHeights = (0.25, 0.5, 0.75)
+
+# Number of straight segments used to approximate a cubic curve
+curveSteps = 8
+
+
+def _getCubicPoints(p0, p1, p2, p3, steps=curveSteps):
+    # Return points on the curve, excluding the start point
+    points = []
+    for i in range(1, steps + 1):
+        t = i / steps
+        mt = 1 - t
+        a = mt * mt * mt
+        b = 3 * mt * mt * t
+        c = 3 * mt * t * t
+        d = t * t * t
+        points.append(
+            (
+                a * p0[0] + b * p1[0] + c * p2[0] + d * p3[0],
+                a * p0[1] + b * p1[1] + c * p2[1] + d * p3[1],
+            )
+        )
+    return points
+
+
+def flattenContour(contour):
+    # Return the contour as a closed polygon
+    points = [(p.x, p.y, p.segmentType) for p in contour]
+    for i, p in enumerate(points):
+        if p[2] is not None:
+            break
+    else:
+        # Quadratic contour without on-curve points
+        return [(x, y) for x, y, _ in points]
+    points = points[i:] + points[:i]
+    polygon = [points[0][:2]]
+    offCurves = []
+    for x, y, segmentType in points[1:] + points[:1]:
+        if segmentType is None:
+            offCurves.append((x, y))
+            continue
+        if segmentType == "curve" and len(offCurves) == 2:
+            polygon.extend(
+                _getCubicPoints(
+                    polygon[-1], offCurves[0], offCurves[1], (x, y)
+                )
+            )
+        else:
+            polygon.extend(offCurves)
+            polygon.append((x, y))
+        offCurves = []
+    return polygon
+
+
+def getHorizontalIntersections(polygons, y):
+    # Return the sorted x coordinates where the outline crosses height y
+    xs = []
+    for polygon in polygons:
+        for i in range(1, len(polygon)):
+            (x0, y0), (x1, y1) = polygon[i - 1], polygon[i]
+            if (y0 <= y < y1) or (y1 <= y < y0):
+                xs.append(x0 + (y - y0) * (x1 - x0) / (y1 - y0))
+    return sorted(xs)
+
+
+class GlyphSnapTargets(object):
+    # Sorted x and y coordinates an anchor can snap to in one glyph:
+    # - x: the advance width centre, the bounding box centre, the top- and
+    #   bottommost on-curve points, and the stem centres and optical centre
+    #   at several heights
+    # - y: the top- and bottommost on-curve points
+    # Components are not included.
+
+    def __init__(self, glyph):
+        xs = {glyph.width / 2}
+        ys = set()
+        onCurves = [
+            (p.x, p.y)
+            for contour in glyph
+            for p in contour
+            if p.segmentType is not None
+        ]
+        if onCurves:
+            yMin = min(p[1] for p in onCurves)
+            yMax = max(p[1] for p in onCurves)
+            xMin = min(p[0] for p in onCurves)
+            xMax = max(p[0] for p in onCurves)
+            ys.update((yMin, yMax))
+            xs.add((xMin + xMax) / 2)
+            xs.update(p[0] for p in onCurves if p[1] in (yMin, yMax))
+            polygons = [flattenContour(contour) for contour in glyph]
+            for h in sampleHeights:
+                intersections = getHorizontalIntersections(
+                    polygons, yMin + h * (yMax - yMin)
+                )
+                if len(intersections) < 2:
+                    continue
+                # optical centre between the outermost intersections
+                xs.add((intersections[0] + intersections[-1]) / 2)
+                # stem centres, using the even-odd rule
+                for i in range(0, len(intersections) - 1, 2):
+                    xs.add((intersections[i] + intersections[i + 1]) / 2)
+        self.x = sorted(int(round(x)) for x in xs)
+        self.y = sorted(int(round(y)) for y in ys)
+
+
+def snapTargetsFactory(glyph):
+    return GlyphSnapTargets(glyph)
+
+
+registerRepresentationFactory(
+    Glyph,
+    representationName,
+    snapTargetsFactory,
+    destructiveNotifications=(
+        "Glyph.ContoursChanged",
+        "Glyph.WidthChanged",
+    ),
+)
+
+
+def getSnapTargets(glyph):
+    # Return the cached GlyphSnapTargets for a fontParts glyph
+    return glyph.naked().getRepresentation(representationName)
+
+
+def getSnappedValue(targets, value, delta):
+    # Move value by delta, but stop at the first target that lies between
+    # the old and the new value
+    newValue = value + delta
+    if delta > 0:
+        i = bisect_right(targets, value)
+        if i < len(targets) and targets[i] < newValue:
+            return targets[i]
+    elif delta < 0:
+        i = bisect_left(targets, value) - 1
+        if i >= 0 and targets[i] > newValue:
+            return targets[i]
+    return newValue
@@ -0,0 +1,13 @@
+from extensionID import extensionID
+from grtools.SettingsStore import SettingsStore
+
+# The settings of the extension, shared by the tool, the overlay and the
+# settings window
+extensionSettings = SettingsStore(
+    extensionID,
+    {
+        "preview": True,
+        "lockOutlines": True,
+        "hide": {},
+    },
+)
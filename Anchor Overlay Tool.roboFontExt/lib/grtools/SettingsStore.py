@@ -0,0 +1,89 @@
+try:
+    from mojo.extensions import getExtensionDefault, setExtensionDefault
+except ImportError:
+    # Outside of RoboFont, settings are kept in memory only
+    getExtensionDefault = None
+    setExtensionDefault = None
+
+try:
+    from PyObjCTools.AppHelper import callLater
+except ImportError:
+    callLater = None
+
+
+class SettingsStore(object):
+    # In-memory copy of extension settings.
+    #
+    # Each key is read from the extension defaults once, on first access,
+    # and converted to the type of its default value. Changed keys are
+    # marked dirty and written back together after a short delay, so a
+    # burst of changes results in one write per changed key. Reading a
+    # setting never touches the user defaults after the first access.
+
+    def __init__(self, extension_id, defaults=None, delay=0.5):
+        self._extension_id = extension_id
+        self._defaults = {}
+        self._values = {}
+        self._dirty = set()
+        self._delay = delay
+        self._generation = 0
+        if defaults is not None:
+            for key, default_value in defaults.items():
+                self.add(key, default_value)
+
+    def add(self, key, default_value):
+        self._defaults[key] = default_value
+
+    def _get_full_key(self, key):
+        return "%s.%s" % (self._extension_id, key)
+
+    def _convert(self, key, value):
+        default_value = self._defaults.get(key)
+        if type(default_value) in (bool, int, float) and value is not None:
+            return type(default_value)(value)
+        return value
+
+    def get(self, key):
+        if key not in self._values:
+            default_value = self._defaults.get(key)
+            if getExtensionDefault is None:
+                value = default_value
+            else:
+                value = getExtensionDefault(
+                    self._get_full_key(key), default_value
+                )
+            self._values[key] = self._convert(key, value)
+        return self._values[key]
+
+    def set(self, key, value):
+        value = self._convert(key, value)
+        if key in self._values and self._values[key] == value:
+            return
+        self._values[key] = value
+        self._dirty.add(key)
+        self._schedule_flush()
+
+    def is_dirty(self, key=None):
+        if key is None:
+            return bool(self._dirty)
+        return key in self._dirty
+
+    def _schedule_flush(self):
+        # Debounce: only the last scheduled flush within the delay runs
+        if callLater is None:
+            self.flush()
+            return
+        self._generation += 1
+        generation = self._generation
+        callLater(self._delay, self._flush_if_current, generation)
+
+    def _flush_if_current(self, generation):
+        if generation == self._generation:
+            self.flush()
+
+    def flush(self):
+        # Write all changed keys to the extension defaults now
+        if setExtensionDefault is not None:
+            for key in sorted(self._dirty):
+                setExtensionDefault(self._get_full_key(key), self._values[key])
+        self._dirty.clear()
@@ -1,13 +1,16 @@
 from defconAppKit.windows.baseWindow import BaseWindowController
-from mojo.extensions import getExtensionDefault, setExtensionDefault
 import vanilla
-from Setting import Setting
+from .Setting import Setting
+from .SettingsStore import SettingsStore
 
 class SettingsWindow(BaseWindowController):
-    def __init__(self, extension_id, name):
+    def __init__(self, extension_id, name, store=None):
         self._extension_id = extension_id
         self._name = name
         self.settings = {}
+        if store is None:
+            store = SettingsStore(extension_id)
+        self.store = store
         
         self.column = 80
         self.width = 300
@@ -15,30 +18,25 @@ class SettingsWindow(BaseWindowController):
     
     def add(self, settings_key, default_value, display_name=None):
         self.settings[settings_key] = Setting(settings_key, default_value, display_name)
+        self.store.add(settings_key, default_value)
     
     def _init_settings(self):
         self.settings = {}
     
     def _load_settings(self):
-        for settings_key, setting in self.settings.iteritems():
-            self.settings[settings_key].value = getExtensionDefault(
-                "%s.%s" % (
-                    self._extension_id,
-                    settings_key
-                ),
-                setting.default_value
-            )
+        for settings_key, setting in self.settings.items():
+            setting.value = self.store.get(settings_key)
     
     def _save_settings(self):
-        for settings_key, setting in self.settings.iteritems():
-            #print "Saving", "%s.%s" % (self._extension_id, settings_key), setting.value, setting.ui_object
-            setExtensionDefault("%s.%s" % (self._extension_id, settings_key), setting.value)
+        # Only changed values are written, see SettingsStore
+        for settings_key, setting in self.settings.items():
+            self.store.set(settings_key, setting.value)
     
     def _build_ui(self):
         self.height = 20 + 26 * len(self.settings)
         self.w = vanilla.Window((self.width, self.height), self._name)
         i = 0
-        for setting in self.settings.itervalues():
+        for setting in self.settings.values():
             ui_objects = []
             if type(setting.default_value) == bool:
                 checkbox = vanilla.CheckBox(
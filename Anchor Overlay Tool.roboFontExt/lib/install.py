@@ -1,5 +1,11 @@
+from time import time
+
+start = time()
+
 from mojo.events import installTool
 from AnchorTool import AnchorTool
 
 installTool(AnchorTool())
-print("Anchor Tool installed in tool bar.")
+print(
+    "Anchor Tool installed in tool bar (%0.1f ms)." % (1000 * (time() - start))
+)
@@ -1,7 +1,10 @@
 from extensionID import extensionID
+from extensionSettings import extensionSettings
 from grtools.SettingsWindow import SettingsWindow
 
-my_settings = SettingsWindow(extensionID, "Anchor Overlay Tool Settings")
+my_settings = SettingsWindow(
+    extensionID, "Anchor Overlay Tool Settings", extensionSettings
+)
 
 my_settings.column = 10
 my_settings.width = 200